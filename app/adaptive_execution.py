@@ -0,0 +1,102 @@
+# adaptive_execution.py
+# Execução adaptativa: reotimiza a ordem das junções durante a execução
+
+from relational_algebra import Selection, Projection, Join
+from executor import execute, apply_selection, apply_projection, apply_join
+from optimizer import (
+    flatten_joins,
+    assign_join_conditions,
+    plan_join_order,
+    CROSS_PRODUCT_CONDITION
+)
+from table_statistics import database_statistics, estimate_cardinality, signature
+
+# Fator de divergência padrão entre cardinalidade estimada e real
+DEFAULT_DIVERGENCE_FACTOR = 4.0
+
+
+def _diverges(estimated, actual, factor):
+    ratio = max(actual, 1) / max(estimated, 1)
+    return ratio >= factor or ratio <= 1 / factor
+
+
+def execute_adaptive(tree, database, stats=None, divergence_factor=DEFAULT_DIVERGENCE_FACTOR):
+    """
+    Executa uma árvore de RA com checkpoints nos pontos de materialização
+    (lado de construção de cada junção e resultado de cada junção).
+
+    Em cada checkpoint a cardinalidade real é registrada em stats e comparada
+    com a estimada; se divergirem pelo fator informado, a ordem das junções
+    restantes é devolvida ao otimizador com os tamanhos observados.
+
+    Args:
+        tree: nó raiz da árvore de RA (normalmente já otimizada)
+        database (dict): banco em memória
+        stats (StatisticsStore, opcional): estatísticas; atualizadas in-place.
+            Padrão: as estatísticas de longa duração do banco (database_statistics)
+        divergence_factor (float): razão real/estimado que dispara a reotimização
+
+    Returns:
+        Tuple[Batch, list]: resultado e lista de eventos da execução
+    """
+    if stats is None:
+        stats = database_statistics(database)
+    events = []
+
+    # 1) Separa os operadores unários acima da região de junções
+    upper = []
+    node = tree
+    while isinstance(node, (Selection, Projection)):
+        upper.append(node)
+        node = node.child
+    if not isinstance(node, Join):
+        return execute(tree, database), events
+
+    def checkpoint(subtree, batch, label):
+        estimated = estimate_cardinality(subtree, stats)
+        stats.record(subtree, batch.size)
+        events.append(f"Checkpoint ({label}): estimado {estimated:.0f}, real {batch.size}")
+        return _diverges(estimated, batch.size, divergence_factor)
+
+    def replan(current_tree, steps):
+        inputs = [inp for inp, _ in steps]
+        conds = [c for _, cs in steps for c in cs]
+        _, new_steps = plan_join_order(current_tree, inputs, conds, stats)
+        order = ", ".join(" ⋈ ".join(sorted(signature(inp)[0])) for inp, _ in new_steps)
+        events.append(f"Reotimização: nova ordem das junções restantes: {order}")
+        return new_steps
+
+    # 2) Plano estático: ordem das entradas da árvore recebida
+    inputs, conditions = flatten_joins(node)
+    current_tree = inputs[0]
+    current = execute(current_tree, database, materialize=False)
+    steps = assign_join_conditions(inputs, conditions)
+    if checkpoint(current_tree, current, "entrada inicial") and steps:
+        steps = replan(current_tree, steps)
+
+    # 3) Executa as junções uma a uma
+    built = {}
+    while steps:
+        inp, conds = steps[0]
+        if id(inp) not in built:
+            built[id(inp)] = execute(inp, database, materialize=False)
+            if checkpoint(inp, built[id(inp)], "lado de construção"):
+                steps = replan(current_tree, steps)
+                continue
+        steps.pop(0)
+        first = conds[0] if conds else CROSS_PRODUCT_CONDITION
+        current_tree = Join(current_tree, inp, first)
+        current = apply_join(current, built[id(inp)], current_tree.condition)
+        for extra in conds[1:]:
+            current_tree = Selection(extra, current_tree)
+            current = apply_selection(current, extra)
+        if checkpoint(current_tree, current, "resultado da junção") and steps:
+            steps = replan(current_tree, steps)
+
+    # 4) Reaplica os operadores superiores (de baixo para cima)
+    for op in reversed(upper):
+        if isinstance(op, Selection):
+            current = apply_selection(current, op.condition)
+        else:
+            current = apply_projection(current, op.attributes)
+    return current.materialize(), events
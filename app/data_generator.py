@@ -0,0 +1,214 @@
+# data_generator.py
+# Gerador determinístico de dados sintéticos para o esquema de exemplo
+
+import bisect
+import itertools
+import random
+from datetime import date, timedelta
+from metadata import TABLES
+
+# Tamanho de cada tabela com fator de escala 1 (tabelas de domínio não escalam)
+BASE_ROWS = {
+    "Cliente": 1000,
+    "Produto": 500,
+    "Pedido": 5000,
+}
+ENDERECOS_POR_CLIENTE = 1.5
+TELEFONES_POR_CLIENTE = 1.2
+MAX_ITENS_POR_PEDIDO = 5
+PROPORCAO_BONIFICACAO = 0.05  # pedidos com itens, mas valor total zero
+
+CATEGORIAS = [
+    "Eletrônicos", "Informática", "Livros", "Games", "Moda", "Calçados",
+    "Esporte", "Casa", "Cozinha", "Jardim", "Brinquedos", "Beleza",
+    "Saúde", "Automotivo", "Papelaria", "Pet Shop", "Música", "Filmes",
+    "Ferramentas", "Alimentos"
+]
+TIPOS_CLIENTE = ["Pessoa Física", "Pessoa Jurídica", "VIP"]
+TIPOS_ENDERECO = ["Residencial", "Comercial", "Entrega"]
+STATUS = ["Aberto", "Pago", "Enviado", "Entregue", "Cancelado"]
+NOMES = [
+    "Luffy", "Zoro", "Nami", "Usopp", "Sanji", "Chopper", "Robin", "Franky",
+    "Brook", "Jinbe", "Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio",
+    "Gabriela", "Heitor", "Isabela", "João", "Larissa", "Marcos", "Natália",
+    "Otávio", "Paula", "Rafael", "Sofia", "Tiago", "Vitória", "Yuri"
+]
+CIDADES = [
+    ("Gramado", "RS"), ("Porto Alegre", "RS"), ("Curitiba", "PR"),
+    ("Florianópolis", "SC"), ("São Paulo", "SP"), ("Campinas", "SP"),
+    ("Rio de Janeiro", "RJ"), ("Belo Horizonte", "MG"), ("Salvador", "BA"),
+    ("Recife", "PE"), ("Fortaleza", "CE"), ("Manaus", "AM"), ("Goiânia", "GO"),
+    ("Brasília", "DF"), ("Vitória", "ES")
+]
+BAIRROS = ["Centro", "Jardim", "Vila Nova", "Boa Vista", "Bela Vista", "Industrial"]
+DATA_INICIAL = date(2020, 1, 1)
+
+
+class _Picker:
+    """
+    Sorteia valores de uma lista com distribuição uniforme (skew=0) ou
+    Zipf (peso 1/rank^skew), usando pesos cumulativos pré-calculados.
+    """
+    def __init__(self, values, skew, rng):
+        self.values = list(values)
+        self.rng = rng
+        self.cum_weights = None
+        if skew > 0:
+            weights = (1.0 / (rank ** skew) for rank in range(1, len(self.values) + 1))
+            self.cum_weights = list(itertools.accumulate(weights))
+
+    def __call__(self):
+        if self.cum_weights is None:
+            return self.values[self.rng.randrange(len(self.values))]
+        x = self.rng.random() * self.cum_weights[-1]
+        return self.values[bisect.bisect_left(self.cum_weights, x)]
+
+
+def _scaled(table, scale_factor):
+    return max(1, int(round(BASE_ROWS[table] * scale_factor)))
+
+
+def _empty(table):
+    return {col: [] for col in TABLES[table]}
+
+
+def _append(data, row):
+    for col, values in data.items():
+        values.append(row.get(col))
+
+
+def _lookup_table(table, descriptions):
+    data = _empty(table)
+    id_col = TABLES[table][0]
+    for i, desc in enumerate(descriptions, start=1):
+        _append(data, {id_col: i, "Descricao": desc})
+    return data
+
+
+def generate_database(scale_factor=1.0, seed=42, skew=0.0):
+    """
+    Gera um banco em memória com todas as tabelas de metadata.TABLES.
+
+    Os dados são determinísticos para a mesma combinação de parâmetros e
+    respeitam as chaves estrangeiras de metadata.FOREIGN_KEYS.
+
+    Args:
+        scale_factor (float): multiplica o tamanho das tabelas de fatos
+        seed (int): semente do gerador pseudoaleatório
+        skew (float): expoente Zipf para a escolha das chaves estrangeiras
+            (0 = uniforme; valores maiores concentram pedidos em poucos
+            clientes, produtos e status)
+
+    Returns:
+        dict: nome_tabela -> {coluna: lista de valores}
+    """
+    rng = random.Random(seed)
+    db = {
+        "Categoria": _lookup_table("Categoria", CATEGORIAS),
+        "TipoCliente": _lookup_table("TipoCliente", TIPOS_CLIENTE),
+        "TipoEndereco": _lookup_table("TipoEndereco", TIPOS_ENDERECO),
+        "Status": _lookup_table("Status", STATUS),
+    }
+
+    # Produto
+    num_produtos = _scaled("Produto", scale_factor)
+    categoria = _Picker(range(1, len(CATEGORIAS) + 1), skew, rng)
+    produto = _empty("Produto")
+    precos = {}
+    for i in range(1, num_produtos + 1):
+        preco = round(rng.uniform(5, 10000), 2)
+        precos[i] = preco
+        _append(produto, {
+            "idProduto": i,
+            "Nome": f"Produto {i}",
+            "Descricao": f"Descrição do produto {i}",
+            "Preco": preco,
+            "QuantEstoque": rng.choice([0] + list(range(1, 200))),
+            "Categoria_idCategoria": categoria(),
+        })
+    db["Produto"] = produto
+
+    # Cliente
+    num_clientes = _scaled("Cliente", scale_factor)
+    tipo_cliente = _Picker(range(1, len(TIPOS_CLIENTE) + 1), skew, rng)
+    cliente = _empty("Cliente")
+    for i in range(1, num_clientes + 1):
+        nome = NOMES[(i - 1) % len(NOMES)]
+        # Primeiro cliente de cada nome tem e-mail "curto" (ex.: Luffy@gmail.com)
+        email = f"{nome}@gmail.com" if i <= len(NOMES) else f"{nome.lower()}{i}@exemplo.com"
+        _append(cliente, {
+            "idCliente": i,
+            "Nome": f"{nome} {i}",
+            "Email": email,
+            "Nascimento": (date(1950, 1, 1) + timedelta(days=rng.randrange(20000))).isoformat(),
+            "Senha": f"{rng.getrandbits(64):016x}",
+            "TipoCliente_idTipoCliente": tipo_cliente(),
+            "DataRegistro": (DATA_INICIAL + timedelta(days=rng.randrange(1500))).isoformat(),
+        })
+    db["Cliente"] = cliente
+
+    # Endereco e Telefone
+    cliente_pick = _Picker(range(1, num_clientes + 1), skew, rng)
+    cidade = _Picker(CIDADES, skew, rng)
+    tipo_endereco = _Picker(range(1, len(TIPOS_ENDERECO) + 1), skew, rng)
+    endereco = _empty("Endereco")
+    for i in range(1, int(num_clientes * ENDERECOS_POR_CLIENTE) + 1):
+        nome_cidade, uf = cidade()
+        _append(endereco, {
+            "idEndereco": i,
+            "EnderecoPadrao": 1 if i <= num_clientes else 0,
+            "Logradouro": f"Rua {rng.randint(1, 500)}",
+            "Numero": str(rng.randint(1, 3000)),
+            "Complemento": rng.choice(["", "Apto 101", "Casa", "Sala 2"]),
+            "Bairro": rng.choice(BAIRROS),
+            "Cidade": nome_cidade,
+            "UF": uf,
+            "CEP": f"{rng.randint(10000, 99999)}-{rng.randint(0, 999):03d}",
+            "TipoEndereco_idTipoEndereco": tipo_endereco(),
+            # Todo cliente tem ao menos um endereço padrão
+            "Cliente_idCliente": i if i <= num_clientes else cliente_pick(),
+        })
+    db["Endereco"] = endereco
+
+    telefone = _empty("Telefone")
+    for i in range(1, int(num_clientes * TELEFONES_POR_CLIENTE) + 1):
+        _append(telefone, {
+            "Numero": f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(0, 9999):04d}",
+            "Cliente_idCliente": i if i <= num_clientes else cliente_pick(),
+        })
+    db["Telefone"] = telefone
+
+    # Pedido e Pedido_has_Produto (valor total = soma dos itens)
+    num_pedidos = _scaled("Pedido", scale_factor)
+    status = _Picker(range(1, len(STATUS) + 1), skew, rng)
+    produto_pick = _Picker(range(1, num_produtos + 1), skew, rng)
+    pedido = _empty("Pedido")
+    itens = _empty("Pedido_has_Produto")
+    id_item = 1
+    for i in range(1, num_pedidos + 1):
+        total = 0.0
+        for _ in range(rng.randint(0, MAX_ITENS_POR_PEDIDO)):
+            id_produto = produto_pick()
+            quantidade = rng.randint(1, 10)
+            total += quantidade * precos[id_produto]
+            _append(itens, {
+                "idPedidoProduto": id_item,
+                "Pedido_idPedido": i,
+                "Produto_idProduto": id_produto,
+                "Quantidade": quantidade,
+                "PrecoUnitario": precos[id_produto],
+            })
+            id_item += 1
+        if rng.random() < PROPORCAO_BONIFICACAO:
+            total = 0.0
+        _append(pedido, {
+            "idPedido": i,
+            "Status_idStatus": status(),
+            "DataPedido": (DATA_INICIAL + timedelta(days=rng.randrange(1800))).isoformat(),
+            "ValorTotalPedido": round(total, 2),
+            "Cliente_idCliente": cliente_pick(),
+        })
+    db["Pedido"] = pedido
+    db["Pedido_has_Produto"] = itens
+
+    return {table: db[table] for table in TABLES}
@@ -0,0 +1,17 @@
+# examples.py
+# Consultas de exemplo usadas pela interface e pelos benchmarks
+
+EXAMPLE_QUERIES = {
+    "Consulta Simples":       "SELECT Nome, Email FROM cliente WHERE idCliente > 5",
+    "Consulta com JOIN":      "SELECT produto.Nome, categoria.Descricao FROM Produto produto JOIN Categoria categoria ON produto.Categoria_idCategoria = categoria.idCategoria",
+    "Consulta Complexa":      (
+        "SELECT cliente.Nome, pedido.idPedido, pedido.DataPedido, Status.Descricao, pedido.ValorTotalPedido, produto.QuantEstoque "
+        "FROM Cliente "
+        "JOIN pedido ON cliente.idCliente = pedido.Cliente_idCliente "
+        "JOIN Status ON Status.idStatus = pedido.Status_idStatus "
+        "JOIN pedido_has_produto ON pedido.idPedido = pedido_has_produto.Pedido_idPedido "
+        "JOIN produto ON produto.idProduto = pedido_has_produto.Produto_idProduto "
+        "WHERE Status.Descricao = 'Aberto' AND cliente.TipoCliente_idTipoCliente = 1 "
+        "AND pedido.ValorTotalPedido = 0 AND produto.QuantEstoque > 0"
+    )
+}
@@ -4,15 +4,19 @@
 from relational_algebra import Relation, Selection, Join, Projection
 
 
-def get_execution_steps(original_tree, optimized_tree, graph, optimization_steps=None):
+def get_execution_steps(original_tree, optimized_tree, graph, optimization_steps=None, comparison=None):
     """
     Gera o plano de execução da árvore de Álgebra Relacional otimizada.
 
+    Quando comparison é informada, cada passo traz a cardinalidade estimada
+    e o plano termina com o custo estimado das duas árvores.
+
     Args:
         original_tree: nó raiz da árvore de RA original (não usado)
         optimized_tree: nó raiz da árvore de RA otimizada
         graph: grafo de operadores (NetworkX DiGraph)
         optimization_steps (list, opcional): lista de strings com passos de otimização
+        comparison (PlanComparison, opcional): resultado de compare_plans
 
     Returns:
         list: lista de passos executáveis
@@ -22,24 +26,37 @@ def get_execution_steps(original_tree, optimized_tree, graph, optimization_steps
     if optimization_steps:
         steps.extend(optimization_steps)
 
+    estimates = {id(op.node): op.rows for op in comparison.optimized} if comparison else {}
+
+    def _rows(node):
+        return f" (~{estimates[id(node)]:.0f} tuplas)" if id(node) in estimates else ""
+
     # 2) percorrer a árvore otimizada em pós-ordem
     def _walk(node):
         if isinstance(node, Relation):
-            steps.append(f"Acesso à tabela base: {node.name}")
+            steps.append(f"Acesso à tabela base: {node.name}{_rows(node)}")
         elif isinstance(node, Selection):
             _walk(node.child)
-            steps.append(f"Filtro: {node.condition}")
+            steps.append(f"Filtro: {node.condition}{_rows(node)}")
         elif isinstance(node, Join):
             _walk(node.left)
             _walk(node.right)
-            steps.append(f"Junção: {node.condition}")
+            steps.append(f"Junção: {node.condition}{_rows(node)}")
         elif isinstance(node, Projection):
             _walk(node.child)
             attrs = ", ".join(node.attributes)
-            steps.append(f"Projeção: {attrs}")
+            steps.append(f"Projeção: {attrs}{_rows(node)}")
         else:
             # nó desconhecido, ignora
             pass
 
     _walk(optimized_tree)
+
+    # 3) resumo do ganho estimado
+    if comparison:
+        steps.append(
+            f"Custo estimado (volume lido e produzido pelos operadores): "
+            f"original {comparison.original_cost:.0f}, otimizado {comparison.optimized_cost:.0f} "
+            f"({comparison.improvement:.0%} de redução)"
+        )
     return steps
@@ -0,0 +1,369 @@
+# executor.py
+# Executor em memória para árvores de Álgebra Relacional
+
+from metadata import TABLES, get_correct_table_name
+from relational_algebra import Relation, Selection, Projection, Join
+from predicates import parse_predicate, evaluate, Comparison, PredicateParseError
+
+
+class ExecutionError(Exception):
+    """Exceção para erros durante a execução de uma árvore de RA"""
+    pass
+
+
+class Batch:
+    """
+    Resultado intermediário com materialização tardia.
+
+    Em vez de copiar colunas a cada operador, o Batch guarda, para cada
+    tabela envolvida, as colunas base e um vetor de seleção (índices das
+    tuplas base). Os valores só são buscados quando uma coluna é lida
+    (predicados, chaves de junção) ou na materialização final.
+
+    sources: tabela (minúsculo) -> {'tabela.coluna': lista de valores base}
+    rowids:  tabela (minúsculo) -> vetor de seleção (lista ou range de índices)
+    size: número de tuplas
+    visible: colunas visíveis após projeções, em ordem (None = todas)
+    """
+    def __init__(self, sources, rowids, size, visible=None):
+        self.sources = sources
+        self.rowids = rowids
+        self.size = size
+        self.visible = visible
+
+    @classmethod
+    def from_rows(cls, table_name, rows):
+        """Converte uma lista de dicts {coluna: valor} em um Batch da tabela."""
+        table = get_correct_table_name(table_name)
+        if table is None:
+            raise ExecutionError(f"Tabela não encontrada: {table_name}")
+        source = {}
+        for col in TABLES[table]:
+            source[f"{table.lower()}.{col.lower()}"] = [_row_value(row, col) for row in rows]
+        return cls({table.lower(): source}, {table.lower(): range(len(rows))}, len(rows))
+
+    @classmethod
+    def empty_like(cls, other):
+        return cls(other.sources, {t: [] for t in other.rowids}, 0, other.visible)
+
+    def __len__(self):
+        return self.size
+
+    def keys(self):
+        """Chaves das colunas visíveis, em ordem."""
+        if self.visible is not None:
+            return list(self.visible)
+        return [k for t in self.rowids for k in self.sources[t]]
+
+    def resolve(self, ref):
+        """Retorna a chave interna de uma coluna (qualificada ou não)."""
+        key = ref.strip().lower()
+        keys = self.keys()
+        if key in keys:
+            return key
+        if '.' not in key:
+            matches = [k for k in keys if k.split('.', 1)[1] == key]
+            if len(matches) == 1:
+                return matches[0]
+        raise ExecutionError(f"Coluna não encontrada no resultado intermediário: {ref}")
+
+    def has_column(self, ref):
+        try:
+            self.resolve(ref)
+        except ExecutionError:
+            return False
+        return True
+
+    def column(self, ref):
+        """Busca os valores de uma coluna através do vetor de seleção."""
+        return self._gather(self.resolve(ref))
+
+    def _gather(self, key):
+        table = key.split('.', 1)[0]
+        values = self.sources[table][key]
+        ids = self.rowids[table]
+        # Tabela inteira, sem filtro: usa a lista base diretamente (somente leitura)
+        if ids == range(len(values)):
+            return values
+        return [values[i] for i in ids]
+
+    def take(self, indices):
+        """Novo Batch apenas com as tuplas nas posições informadas (sem copiar colunas)."""
+        rowids = {}
+        for t, ids in self.rowids.items():
+            if isinstance(ids, range) and ids.start == 0 and ids.step == 1:
+                rowids[t] = indices
+            else:
+                rowids[t] = [ids[i] for i in indices]
+        return Batch(self.sources, rowids, len(indices), self.visible)
+
+    def project(self, attributes):
+        """Restringe as colunas visíveis; tabelas sem colunas visíveis são descartadas."""
+        visible = []
+        for attr in attributes:
+            key = self.resolve(attr)
+            if key not in visible:
+                visible.append(key)
+        tables = {k.split('.', 1)[0] for k in visible}
+        rowids = {t: ids for t, ids in self.rowids.items() if t in tables}
+        return Batch(self.sources, rowids, self.size, visible)
+
+    def materialize(self):
+        """Busca as colunas visíveis e devolve um Batch compacto."""
+        sources = {}
+        for key in self.keys():
+            sources.setdefault(key.split('.', 1)[0], {})[key] = self._gather(key)
+        rowids = {t: range(self.size) for t in sources}
+        return Batch(sources, rowids, self.size, self.keys())
+
+    def concat(self, other):
+        """
+        Concatena dois Batches com as mesmas colunas. Se apontam para as mesmas
+        colunas base, apenas os vetores de seleção são concatenados.
+        """
+        if other is None or other.size == 0:
+            return self
+        if self.size == 0 and self.keys() == other.keys():
+            return other
+        if self._same_sources(other):
+            rowids = {t: list(ids) + list(other.rowids[t]) for t, ids in self.rowids.items()}
+            return Batch(self.sources, rowids, self.size + other.size, self.visible)
+        a, b = self.materialize(), other.materialize()
+        sources = {}
+        for key in a.keys():
+            table = key.split('.', 1)[0]
+            sources.setdefault(table, {})[key] = a._gather(key) + b.column(key)
+        rowids = {t: range(a.size + b.size) for t in sources}
+        return Batch(sources, rowids, a.size + b.size, a.keys())
+
+    def copy(self):
+        """Cópia com vetores de seleção próprios (listas), pronta para append()."""
+        rowids = {t: list(ids) for t, ids in self.rowids.items()}
+        visible = None if self.visible is None else list(self.visible)
+        return Batch(self.sources, rowids, self.size, visible)
+
+    def append(self, other):
+        """
+        Acrescenta as tuplas de other neste Batch, estendendo os vetores de
+        seleção no lugar (sem recopiá-los). Só é possível quando other aponta
+        para as mesmas colunas base; use em Batches obtidos com copy().
+
+        Returns:
+            bool: False se as colunas base diferem (nada é alterado)
+        """
+        if other is None or other.size == 0:
+            return True
+        if not self._same_sources(other):
+            return False
+        for t, ids in self.rowids.items():
+            if not isinstance(ids, list):
+                ids = self.rowids[t] = list(ids)
+            ids.extend(other.rowids[t])
+        self.size += other.size
+        return True
+
+    def _same_sources(self, other):
+        if self.rowids.keys() != other.rowids.keys() or self.keys() != other.keys():
+            return False
+        for t in self.rowids:
+            mine, theirs = self.sources[t], other.sources.get(t, {})
+            if mine.keys() != theirs.keys():
+                return False
+            if any(mine[k] is not theirs[k] for k in mine):
+                return False
+        return True
+
+    def rows(self):
+        """Lista de tuplas na ordem das colunas visíveis."""
+        keys = self.keys()
+        if not keys:
+            return []
+        return list(zip(*(self._gather(k) for k in keys)))
+
+
+# --- Banco de dados em memória ---
+# database: dicionário nome_tabela -> {coluna: lista de valores}
+
+def insert_rows(database, table_name, rows):
+    """Acrescenta tuplas (dicts {coluna: valor}) a uma tabela do banco em memória."""
+    table = get_correct_table_name(table_name)
+    if table is None:
+        raise ExecutionError(f"Tabela não encontrada: {table_name}")
+    data = database.setdefault(table, {col: [] for col in TABLES[table]})
+    for col in TABLES[table]:
+        data[col].extend(_row_value(row, col) for row in rows)
+
+
+def table_size(database, table_name):
+    table = get_correct_table_name(table_name)
+    data = database.get(table) if table else None
+    if not data:
+        return 0
+    return len(next(iter(data.values())))
+
+
+def _row_value(row, column):
+    if column in row:
+        return row[column]
+    for k, v in row.items():
+        if k.lower() == column.lower():
+            return v
+    return None
+
+
+# --- Avaliação de condições ---
+
+def _predicate(condition):
+    try:
+        return parse_predicate(str(condition).strip())
+    except PredicateParseError as e:
+        raise ExecutionError(f"Condição não suportada: {condition} ({e})")
+
+
+def filter_indices(condition, batch):
+    """Retorna as posições das tuplas de batch que satisfazem condition."""
+    return evaluate(_predicate(condition), batch)
+
+
+# --- Operadores físicos ---
+
+def scan(database, table_name, start=0):
+    """
+    Leitura de uma tabela base a partir da tupla start (padrão: tabela inteira).
+    Nenhum valor é copiado: o vetor de seleção é um range sobre as colunas base.
+    """
+    table = get_correct_table_name(table_name)
+    if table is None:
+        raise ExecutionError(f"Tabela não encontrada: {table_name}")
+    data = database.get(table) or {col: [] for col in TABLES[table]}
+    source = {f"{table.lower()}.{col.lower()}": data[col] for col in TABLES[table]}
+    ids = range(start, table_size(database, table))
+    return Batch({table.lower(): source}, {table.lower(): ids}, len(ids))
+
+
+def apply_selection(batch, condition):
+    return batch.take(filter_indices(condition, batch))
+
+
+def apply_projection(batch, attributes):
+    return batch.project(attributes)
+
+
+def apply_join(left, right, condition):
+    """
+    Junção de dois Batches. Condições de igualdade entre colunas usam hash join
+    (construção sobre o lado direito); as demais usam laço aninhado.
+    """
+    keys = equi_join_keys(condition, left, right)
+    left_idx, right_idx = [], []
+    if keys:
+        left_key, right_key = keys
+        # 1) Build: tabela hash sobre o lado direito
+        index = build_hash_index(right, right_key)
+        # 2) Probe: percorre o lado esquerdo
+        return index_join(left, left_key, right, index)
+
+    # Laço aninhado: produto cartesiano seguido de filtro
+    for i in range(left.size):
+        for j in range(right.size):
+            left_idx.append(i)
+            right_idx.append(j)
+    product = _merge(left.take(left_idx), right.take(right_idx))
+    return apply_selection(product, condition)
+
+
+def build_hash_index(batch, key, index=None, offset=0):
+    """
+    Índice hash valor -> posições de uma coluna de batch (nulos ignorados).
+    Com index e offset, acrescenta as tuplas de batch a um índice existente,
+    deslocando as posições em offset.
+    """
+    if index is None:
+        index = {}
+    for j, v in enumerate(batch.column(key), start=offset):
+        if v is not None:
+            index.setdefault(v, []).append(j)
+    return index
+
+
+def index_join(probe, probe_key, build, index, probe_left=True):
+    """
+    Hash join sondando um índice já construído sobre build (ver
+    build_hash_index). O custo é proporcional a probe e às tuplas casadas.
+    """
+    probe_idx, build_idx = [], []
+    for i, v in enumerate(probe.column(probe_key)):
+        for j in index.get(v, ()):
+            probe_idx.append(i)
+            build_idx.append(j)
+    p, b = probe.take(probe_idx), build.take(build_idx)
+    return _merge(p, b) if probe_left else _merge(b, p)
+
+
+def equi_join_keys(condition, left, right):
+    """
+    Colunas (esquerda, direita) de uma condição de igualdade entre os dois
+    lados, ou None se a junção não puder usar hash.
+    """
+    try:
+        pred = parse_predicate(str(condition).strip())
+    except PredicateParseError:
+        return None
+    if not isinstance(pred, Comparison) or pred.op != '=':
+        return None
+    lhs, rhs = pred.left, pred.right
+    if lhs[0] != 'col' or rhs[0] != 'col':
+        return None
+    if left.has_column(lhs[1]) and right.has_column(rhs[1]):
+        return lhs[1], rhs[1]
+    if left.has_column(rhs[1]) and right.has_column(lhs[1]):
+        return rhs[1], lhs[1]
+    return None
+
+
+def _merge(left, right):
+    sources = dict(left.sources)
+    sources.update(right.sources)
+    rowids = dict(left.rowids)
+    rowids.update(right.rowids)
+    visible = None
+    if left.visible is not None or right.visible is not None:
+        visible = left.keys() + right.keys()
+    return Batch(sources, rowids, left.size, visible)
+
+
+def execute(node, database, materialize=True):
+    """
+    Executa uma árvore de Álgebra Relacional sobre o banco em memória.
+
+    Os operadores trocam apenas vetores de seleção; as projeções internas
+    (de push_projection_tree) só restringem as colunas visíveis. Os valores
+    das colunas de saída são buscados uma única vez, na materialização final.
+
+    Args:
+        node: nó raiz da árvore de RA
+        database (dict): nome_tabela -> {coluna: lista de valores}
+        materialize (bool): se False, devolve o Batch sem buscar as colunas
+
+    Returns:
+        Batch: resultado da consulta
+
+    Raises:
+        ExecutionError: se a árvore contiver nós ou condições não suportados
+    """
+    result = _run(node, database)
+    return result.materialize() if materialize else result
+
+
+def _run(node, database):
+    if isinstance(node, Relation):
+        return scan(database, node.name)
+    if isinstance(node, Selection):
+        return apply_selection(_run(node.child, database), node.condition)
+    if isinstance(node, Projection):
+        return apply_projection(_run(node.child, database), node.attributes)
+    if isinstance(node, Join):
+        left = _run(node.left, database)
+        right = _run(node.right, database)
+        return apply_join(left, right, node.condition)
+    raise ExecutionError(f"Nó não suportado: {node!r}")
@@ -37,15 +37,21 @@ def resumir_label(node, max_len=30):
         return label[:max_len] + ("..." if len(label) > max_len else "")
 
 
-def generate_operator_graph(original_tree, optimized_tree):
+def generate_operator_graph(original_tree, optimized_tree, path=None, comparison=None):
     """
     Gera um grafo hierárquico para a árvore de Álgebra Relacional otimizada,
     com layout bottom-up, espaçamento controlado, labels quebrados em múltiplas linhas,
     e estilos distintos por tipo de nó, incluindo legenda de cores.
 
+    Quando comparison é informada, cada nó mostra a cardinalidade estimada e
+    os operadores cuja saída diminuiu em relação à árvore original recebem
+    borda verde.
+
     Args:
-        original_tree: raiz da árvore original (não usado)
+        original_tree: raiz da árvore original (não usada)
         optimized_tree: raiz da árvore otimizada
+        path (str, opcional): arquivo de saída da imagem (padrão: diretório temporário)
+        comparison (PlanComparison, opcional): resultado de compare_plans
 
     Returns:
         Tuple[DiGraph, str]: grafo NetworkX e caminho da imagem gerada
@@ -53,6 +59,13 @@ def generate_operator_graph(original_tree, optimized_tree):
     tree = optimized_tree
     G = nx.DiGraph()
 
+    # Estimativas de cardinalidade e operadores que encolheram
+    if comparison is not None:
+        estimates = {id(op.node): op.rows for op in comparison.optimized}
+        shrunk = {id(op.node) for op in comparison.shrunk_operators()}
+    else:
+        estimates, shrunk = {}, set()
+
     # 1) Construção recursiva de nós e arestas
     def _add(node, is_root=False):
         nid = id(node)
@@ -61,6 +74,8 @@ def generate_operator_graph(original_tree, optimized_tree):
         # Label informativo e quebra de linha
         short_label = resumir_label(node, 30)
         wrapped_label = textwrap.fill(short_label, width=18)
+        if nid in estimates:
+            wrapped_label += f"\n~{estimates[nid]:.0f} tuplas"
         # Determina tipo e forma de nó
         if isinstance(node, Relation):
             ntype, shape = 'table', 'o'
@@ -74,7 +89,11 @@ def generate_operator_graph(original_tree, optimized_tree):
             ntype, shape = 'other', 'o'
         # Destaca o nó raiz (projeção final)
         border = 4.0 if is_root else 1.0
-        G.add_node(nid, label=wrapped_label, type=ntype, shape=shape, tooltip=str(node), border=border)
+        edge = 'black'
+        if nid in shrunk:
+            border, edge = max(border, 3.0), 'darkgreen'
+        G.add_node(nid, label=wrapped_label, type=ntype, shape=shape, tooltip=str(node),
+                   border=border, edge=edge)
         # Adiciona arestas para filhos
         if hasattr(node, 'child'):
             _add(node.child)
@@ -110,6 +129,7 @@ def generate_operator_graph(original_tree, optimized_tree):
         nodes = [n for n, d in G.nodes(data=True) if d['shape'] == shape]
         colors = [color_map[G.nodes[n]['type']] for n in nodes]
         borders = [G.nodes[n].get('border', 1.0) for n in nodes]
+        edges = [G.nodes[n].get('edge', 'black') for n in nodes]
         nx.draw_networkx_nodes(
             G,
             pos,
@@ -118,7 +138,7 @@ def generate_operator_graph(original_tree, optimized_tree):
             node_shape=shape,
             node_size=2200,  # aumenta o tamanho dos nós
             linewidths=borders,
-            edgecolors='black',
+            edgecolors=edges,
             alpha=0.95,
             ax=ax
         )
@@ -140,6 +160,11 @@ def generate_operator_graph(original_tree, optimized_tree):
         mpatches.Patch(color=color, label=ntype.capitalize())
         for ntype, color in color_map.items()
     ]
+    if shrunk:
+        legend_handles.append(
+            mpatches.Patch(facecolor='white', edgecolor='darkgreen', linewidth=3,
+                           label='Saída reduzida')
+        )
     ax.legend(
         handles=legend_handles,
         title='Tipos de Operadores',
@@ -152,9 +177,9 @@ def generate_operator_graph(original_tree, optimized_tree):
     ax.set_axis_off()
     plt.tight_layout()
 
-    # 4) Salva imagem em diretório temporário
-    tmp = tempfile.gettempdir()
-    path = os.path.join(tmp, 'operator_graph.png')
+    # 4) Salva imagem (por padrão, em diretório temporário)
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), 'operator_graph.png')
     fig.savefig(path, dpi=200, bbox_inches='tight')
     plt.close(fig)
 
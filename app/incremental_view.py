@@ -0,0 +1,169 @@
+# incremental_view.py
+# Manutenção incremental de visões materializadas (consultas permanentes)
+
+from metadata import get_correct_table_name
+from relational_algebra import Relation, Selection, Projection, Join
+from executor import (
+    Batch,
+    ExecutionError,
+    scan,
+    apply_selection,
+    apply_projection,
+    apply_join,
+    build_hash_index,
+    index_join,
+    equi_join_keys,
+    insert_rows,
+    table_size
+)
+
+
+class _JoinInput:
+    """
+    Estado de uma entrada de junção: tuplas acumuladas (vetores de seleção) e,
+    para junções por igualdade, um índice hash persistente na chave de junção.
+    Ambos crescem no lugar a cada delta.
+    """
+    def __init__(self, batch, key):
+        self.batch = batch.copy()
+        self.key = key
+        self.index = build_hash_index(self.batch, key) if key else None
+
+    def append(self, delta):
+        offset = self.batch.size
+        if self.batch.append(delta):
+            if self.index is not None:
+                build_hash_index(delta, self.key, self.index, offset)
+            return
+        # Colunas base diferentes (ex.: Batch.from_rows): materializa e reindexa
+        self.batch = self.batch.concat(delta).copy()
+        if self.key:
+            self.index = build_hash_index(self.batch, self.key)
+
+
+class MaterializedView:
+    """
+    Visão materializada sobre uma árvore de RA, mantida incrementalmente.
+
+    Suporta apenas inserções (lotes de novas tuplas nas tabelas base). As
+    deltas são propagadas pelas regras:
+      Δσ(R)     = σ(ΔR)
+      Δπ(R)     = π(ΔR)
+      Δ(R ⋈ S)  = (ΔR ⋈ S) ∪ (R ⋈ ΔS) ∪ (ΔR ⋈ ΔS)
+    onde R e S são os estados anteriores das entradas da junção, guardados
+    em memória para cada nó Join. Em junções por igualdade, ΔR e ΔS apenas
+    sondam índices hash persistentes de S e R, de modo que o custo de cada
+    lote depende do tamanho da delta, e não do tamanho das tabelas.
+    """
+    def __init__(self, tree, database):
+        self.tree = tree
+        self.database = database
+        # id(nó Join) -> (_JoinInput esquerda, _JoinInput direita)
+        self._states = {}
+        self.result = self._materialize(tree).copy()
+
+    def _materialize(self, node):
+        if isinstance(node, Relation):
+            return scan(self.database, node.name)
+        if isinstance(node, Selection):
+            return apply_selection(self._materialize(node.child), node.condition)
+        if isinstance(node, Projection):
+            return apply_projection(self._materialize(node.child), node.attributes)
+        if isinstance(node, Join):
+            left = self._materialize(node.left)
+            right = self._materialize(node.right)
+            keys = equi_join_keys(node.condition, left, right) or (None, None)
+            self._states[id(node)] = (_JoinInput(left, keys[0]), _JoinInput(right, keys[1]))
+            return apply_join(left, right, node.condition)
+        raise ExecutionError(f"Nó não suportado: {node!r}")
+
+    def propagate(self, table_name, delta):
+        """
+        Propaga um Batch de novas tuplas de table_name até a raiz, atualizando
+        os estados internos e o resultado (no lugar). Não altera o banco base.
+
+        Returns:
+            Batch: tuplas acrescentadas ao resultado (pode ser vazio)
+        """
+        result_delta = self._propagate(self.tree, table_name.lower(), delta)
+        if result_delta is None:
+            return Batch.empty_like(self.result)
+        if not self.result.append(result_delta):
+            self.result = self.result.concat(result_delta).copy()
+        return result_delta
+
+    def _propagate(self, node, table, delta):
+        if isinstance(node, Relation):
+            return delta if node.name.lower() == table else None
+        if isinstance(node, Selection):
+            d = self._propagate(node.child, table, delta)
+            return None if d is None else apply_selection(d, node.condition)
+        if isinstance(node, Projection):
+            d = self._propagate(node.child, table, delta)
+            return None if d is None else apply_projection(d, node.attributes)
+        if isinstance(node, Join):
+            d_left = self._propagate(node.left, table, delta)
+            d_right = self._propagate(node.right, table, delta)
+            if d_left is None and d_right is None:
+                return None
+            old_left, old_right = self._states[id(node)]
+            indexed = old_left.index is not None and old_right.index is not None
+            parts = []
+            if d_left is not None:
+                if indexed:
+                    parts.append(index_join(d_left, old_left.key, old_right.batch, old_right.index))
+                else:
+                    parts.append(apply_join(d_left, old_right.batch, node.condition))
+            if d_right is not None:
+                if indexed:
+                    parts.append(index_join(
+                        d_right, old_right.key, old_left.batch, old_left.index, probe_left=False
+                    ))
+                else:
+                    parts.append(apply_join(old_left.batch, d_right, node.condition))
+            if d_left is not None and d_right is not None:
+                parts.append(apply_join(d_left, d_right, node.condition))
+            # Atualiza os estados das entradas (vetores de seleção e índices)
+            if d_left is not None:
+                old_left.append(d_left)
+            if d_right is not None:
+                old_right.append(d_right)
+            out = parts[0]
+            for p in parts[1:]:
+                out = out.concat(p)
+            return out
+        raise ExecutionError(f"Nó não suportado: {node!r}")
+
+
+class ViewManager:
+    """
+    Registro de consultas permanentes sobre um mesmo banco em memória.
+
+    Lotes inseridos via append() são gravados no banco base e propagados para
+    todas as visões como um vetor de seleção sobre as tuplas novas; os
+    estados anteriores continuam válidos porque só referenciam índices antigos.
+    """
+    def __init__(self, database):
+        self.database = database
+        self.views = {}
+
+    def register(self, name, tree):
+        """Registra uma árvore de RA (normalmente já otimizada) como visão."""
+        view = MaterializedView(tree, self.database)
+        self.views[name] = view
+        return view
+
+    def append(self, table_name, rows):
+        """
+        Acrescenta tuplas a uma tabela base e atualiza todas as visões.
+
+        Returns:
+            dict: nome da visão -> Batch com as tuplas novas no resultado
+        """
+        table = get_correct_table_name(table_name)
+        if table is None:
+            raise ExecutionError(f"Tabela não encontrada: {table_name}")
+        start = table_size(self.database, table)
+        insert_rows(self.database, table, rows)
+        delta = scan(self.database, table, start)
+        return {name: view.propagate(table, delta) for name, view in self.views.items()}
@@ -1,16 +1,14 @@
 # app/main.py
 
 import streamlit as st
-import os
+import io
 from PIL import Image
 
 # Importar nossos módulos
-from parser import parse_sql, SQLParseError
-from relational_algebra import ast_to_relational_algebra
-from optimizer import optimize_query
-from graph_generator import generate_operator_graph
-from execution_plan import get_execution_steps
+from parser import SQLParseError
+from query_cache import QueryCache, process_query
 from metadata import TABLES
+from examples import EXAMPLE_QUERIES
 
 # Configuração da página
 st.set_page_config(
@@ -23,19 +21,18 @@ st.set_page_config(
 st.title("Processador de Consultas SQL")
 st.markdown("### Visualizador e Otimizador de Árvores de Álgebra Relacional")
 
-# --- Inicializa o estado da sessão ---
-for key in (
-    'sql_query',
-    'parsed_sql',
-    'relational_algebra',
-    'optimized_algebra',
-    'ra_optimization_steps',
-    'operator_graph',
-    'execution_plan'
-):
+# --- Cache compartilhado entre todas as sessões do processo ---
+@st.cache_resource
+def get_query_cache():
+    return QueryCache()
+
+cache = get_query_cache()
+
+# --- Inicializa o estado da sessão (apenas chaves leves) ---
+# processed_sql: consulta processada; os artefatos ficam no cache compartilhado
+for key in ('sql_query', 'processed_sql'):
     if key not in st.session_state:
-        # ra_optimization_steps deve ser lista vazia por padrão
-        st.session_state[key] = [] if key == 'ra_optimization_steps' else None
+        st.session_state[key] = None
 
 # --- Sidebar: metadados e exemplos ---
 with st.sidebar:
@@ -46,23 +43,9 @@ with st.sidebar:
             st.write(", ".join(cols))
 
     st.markdown("**Consultas de Exemplo**")
-    example_queries = {
-        "Consulta Simples":       "SELECT Nome, Email FROM cliente WHERE idCliente > 5",
-        "Consulta com JOIN":      "SELECT produto.Nome, categoria.Descricao FROM Produto produto JOIN Categoria categoria ON produto.Categoria_idCategoria = categoria.idCategoria",
-        "Consulta Complexa":      (
-            "SELECT cliente.Nome, pedido.idPedido, pedido.DataPedido, Status.Descricao, pedido.ValorTotalPedido, produto.QuantEstoque "
-            "FROM Cliente "
-            "JOIN pedido ON cliente.idCliente = pedido.Cliente_idCliente "
-            "JOIN Status ON Status.idStatus = pedido.Status_idStatus "
-            "JOIN pedido_has_produto ON pedido.idPedido = pedido_has_produto.Pedido_idPedido "
-            "JOIN produto ON produto.idProduto = pedido_has_produto.Produto_idProduto "
-            "WHERE Status.Descricao = 'Aberto' AND cliente.TipoCliente_idTipoCliente = 1 "
-            "AND pedido.ValorTotalPedido = 0 AND produto.QuantEstoque > 0"
-        )
-    }
-    escolha = st.selectbox("Selecione um exemplo:", list(example_queries.keys()))
+    escolha = st.selectbox("Selecione um exemplo:", list(EXAMPLE_QUERIES.keys()))
     if st.button("Carregar Exemplo"):
-        st.session_state.sql_query = example_queries[escolha]
+        st.session_state.sql_query = EXAMPLE_QUERIES[escolha]
 
 # --- Área principal: entrada SQL ---
 sql_query = st.text_area(
@@ -76,46 +59,10 @@ if st.button("Processar Consulta"):
         st.warning("Por favor, digite uma consulta SQL.")
     else:
         try:
-            # Limpar estados anteriores (exceto sql_query)
-            for k in (
-                'parsed_sql',
-                'relational_algebra',
-                'optimized_algebra',
-                'operator_graph',
-                'execution_plan'
-            ):
-                st.session_state[k] = None
-            # Zera as otimizações para lista vazia
-            st.session_state.ra_optimization_steps = []
-
-            # 1) Parse SQL
-            parsed = parse_sql(sql_query)
-            st.session_state.parsed_sql = parsed
-
-            # 2) Converter para árvore de Álgebra Relacional original
-            orig_ra = ast_to_relational_algebra(parsed)
-            st.session_state.relational_algebra = orig_ra
-
-            # 3) Aplicar otimizações sobre a árvore de RA
-            # ...
-            opt_ra, steps = optimize_query(parsed)
-            # Se por algum motivo não houve retorno, caia no original
-            if opt_ra is None:
-                opt_ra = orig_ra
-                steps  = ["Nenhuma otimização aplicada."]
-            st.session_state.optimized_algebra     = opt_ra
-            st.session_state.ra_optimization_steps = steps
-
-            # 4) Gere sempre um grafo, mesmo que otimizado == original
-            G, path = generate_operator_graph(orig_ra, opt_ra)
-            st.session_state.operator_graph = (G, path)
-            # ...
-
-
-            # 5) Gerar o plano de execução (incluindo passos de otimização)
-            plan = get_execution_steps(orig_ra, opt_ra, G, st.session_state.ra_optimization_steps)
-            st.session_state.execution_plan = plan
-
+            st.session_state.processed_sql = None
+            # Parse, RA, otimização, grafo e plano (reaproveitados do cache)
+            process_query(cache, sql_query)
+            st.session_state.processed_sql = sql_query
             st.success("Consulta processada com sucesso!")
 
         except SQLParseError as e:
@@ -124,34 +71,39 @@ if st.button("Processar Consulta"):
             st.error(f"Erro inesperado: {e}")
 
 # --- Aba de resultados ---
-if st.session_state.parsed_sql:
-    tab1, tab2, tab3, tab4 = st.tabs([
+# Recupera os artefatos do cache (recalculados apenas se tiverem sido removidos)
+result = None
+if st.session_state.processed_sql:
+    try:
+        result = process_query(cache, st.session_state.processed_sql)
+    except SQLParseError:
+        st.session_state.processed_sql = None
+
+if result:
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "Árvore de Álgebra Relacional",
         "Grafo de Operadores",
         "Plano de Execução",
+        "Comparação de Planos",
         "Detalhes da Consulta"
     ])
 
     # 1) Árvore de Álgebra Relacional
     with tab1:
         st.subheader("Árvore de Álgebra Relacional Original")
-        st.code(str(st.session_state.relational_algebra))
+        st.code(str(result['original']))
 
         st.subheader("Árvore de Álgebra Relacional Otimizada")
-        for s in st.session_state.ra_optimization_steps or []:
+        for s in result['steps'] or []:
             st.info(s)
-        st.code(str(st.session_state.optimized_algebra))
+        st.code(str(result['optimized']))
 
     # 2) Grafo de Operadores
    # Aba 2: Grafo de Operadores
     with tab2:
         st.subheader("Grafo de Operadores")
-        if st.session_state.operator_graph:
-            G, path = st.session_state.operator_graph
-            if os.path.exists(path):
-                st.image(Image.open(path), use_column_width=True)
-            else:
-                st.error("Erro ao carregar o grafo.")
+        if result['image']:
+            st.image(Image.open(io.BytesIO(result['image'])), use_column_width=True)
         else:
             st.error("Grafo não disponível.")
 
@@ -159,32 +111,49 @@ if st.session_state.parsed_sql:
     # 3) Plano de Execução
     with tab3:
         st.subheader("Plano de Execução")
-        for i, step in enumerate(st.session_state.execution_plan or [], start=1):
+        for i, step in enumerate(result['plan'] or [], start=1):
             st.write(f"Passo {i}: {step}")
 
-    # 4) Detalhes do Parse
+    # 4) Comparação quantitativa: original x otimizada
     with tab4:
+        st.subheader("Comparação de Planos (estimativas)")
+        comparison = result['comparison']
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Custo original", f"{comparison.original_cost:,.0f}")
+        col2.metric("Custo otimizado", f"{comparison.optimized_cost:,.0f}")
+        col3.metric("Redução", f"{comparison.improvement:.0%}")
+        st.caption(
+            "Custo = volume dos resultados intermediários (tuplas x atributos), "
+            "estimado sobre os dados sintéticos com fator de escala 1."
+        )
+        st.dataframe(comparison.to_rows(), use_container_width=True)
+        shrunk = comparison.shrunk_operators()
+        if shrunk:
+            st.markdown("**Operadores cuja saída diminuiu**")
+            for op in shrunk:
+                st.success(op.label)
+
+    # 5) Detalhes do Parse
+    with tab5:
         st.subheader("Detalhes da Consulta Parseada")
         st.markdown("**SELECT**")
-        st.code(", ".join(st.session_state.parsed_sql['select']))
+        st.code(", ".join(result['parsed']['select']))
         st.markdown("**FROM**")
-        st.code(", ".join(st.session_state.parsed_sql['from']))
-        if st.session_state.parsed_sql.get('joins'):
+        st.code(", ".join(result['parsed']['from']))
+        if result['parsed'].get('joins'):
             st.markdown("**JOINs**")
-            for j in st.session_state.parsed_sql['joins']:
+            for j in result['parsed']['joins']:
                 st.code(f"JOIN {j['table']} ON {j['condition']}")
-        if st.session_state.parsed_sql.get('where'):
+        if result['parsed'].get('where'):
             st.markdown("**WHERE**")
-            for cond in st.session_state.parsed_sql['where']:
+            for cond in result['parsed']['where']:
                 st.code(cond)
 
-# --- Limpeza de arquivos temporários ---
-def cleanup():
-    if st.session_state.operator_graph:
-        try:
-            os.remove(st.session_state.operator_graph[1])
-        except FileNotFoundError:
-            pass
-
-import atexit
-atexit.register(cleanup)
+# --- Uso do cache compartilhado ---
+with st.sidebar:
+    info = cache.stats()
+    st.caption(
+        f"Cache compartilhado: {info['entries']} entradas, "
+        f"{info['bytes'] / (1024 * 1024):.1f} MB de {info['max_bytes'] / (1024 * 1024):.0f} MB, "
+        f"{info['hits']} acertos, {info['evictions']} remoções"
+    )
@@ -14,32 +14,42 @@ TABLES = {
     "Pedido_has_Produto": ["idPedidoProduto", "Pedido_idPedido", "Produto_idProduto", "Quantidade", "PrecoUnitario"]
 }   
 
+# Chaves estrangeiras: (tabela, coluna, tabela referenciada, coluna referenciada)
+FOREIGN_KEYS = [
+    ("Produto", "Categoria_idCategoria", "Categoria", "idCategoria"),
+    ("Cliente", "TipoCliente_idTipoCliente", "TipoCliente", "idTipoCliente"),
+    ("Endereco", "TipoEndereco_idTipoEndereco", "TipoEndereco", "idTipoEndereco"),
+    ("Endereco", "Cliente_idCliente", "Cliente", "idCliente"),
+    ("Telefone", "Cliente_idCliente", "Cliente", "idCliente"),
+    ("Pedido", "Status_idStatus", "Status", "idStatus"),
+    ("Pedido", "Cliente_idCliente", "Cliente", "idCliente"),
+    ("Pedido_has_Produto", "Pedido_idPedido", "Pedido", "idPedido"),
+    ("Pedido_has_Produto", "Produto_idProduto", "Produto", "idProduto")
+]
+
+# Índices do catálogo (minúsculo -> nome correto), calculados uma única vez
+# por processo e compartilhados por todas as sessões
+_TABLE_INDEX = {t.lower(): t for t in TABLES}
+_COLUMN_INDEX = {
+    t.lower(): {c.lower(): c for c in cols}
+    for t, cols in TABLES.items()
+}
+
 # Função auxiliar para validar se uma tabela existe
 def table_exists(table_name):
-    return table_name.lower() in [t.lower() for t in TABLES.keys()]
+    return table_name.lower() in _TABLE_INDEX
 
 # Função auxiliar para validar se uma coluna existe em uma tabela
 def column_exists(table_name, column_name):
-    if not table_exists(table_name):
-        return False
-    
-    table_key = next(key for key in TABLES.keys() if key.lower() == table_name.lower())
-    return column_name.lower() in [col.lower() for col in TABLES[table_key]]
+    return column_name.lower() in _COLUMN_INDEX.get(table_name.lower(), {})
 
 # Função para obter o nome correto da tabela (respeitando case-sensitivity)
 def get_correct_table_name(table_name):
-    if not table_exists(table_name):
-        return None
-    
-    return next(key for key in TABLES.keys() if key.lower() == table_name.lower())
+    return _TABLE_INDEX.get(table_name.lower())
 
 # Função para obter o nome correto da coluna (respeitando case-sensitivity)
 def get_correct_column_name(table_name, column_name):
-    if not table_exists(table_name) or not column_exists(table_name, column_name):
-        return None
-    
-    table_key = get_correct_table_name(table_name)
-    return next(col for col in TABLES[table_key] if col.lower() == column_name.lower())
+    return _COLUMN_INDEX.get(table_name.lower(), {}).get(column_name.lower())
 
 # Função para validar uma coluna com tabela qualificada (formato: tabela.coluna)
 def validate_qualified_column(qualified_column):
@@ -9,24 +9,45 @@ from relational_algebra import (
     Join,
     Condition
 )
+from table_statistics import estimate_cardinality, selectivity
+from predicates import (
+    parse_predicate,
+    predicate_tables,
+    to_cnf,
+    implied_table_filters,
+    PredicateParseError
+)
+
+# Condição usada quando não há predicado de junção (produto cartesiano)
+CROSS_PRODUCT_CONDITION = "1 = 1"
 
 
 def build_ra_with_early_selection(parsed_sql):
     """
     Constrói a árvore de RA aplicando filtros de tabela única antes dos JOINs,
     depois filtros multi-tabela e projeção final.
+
+    Cada condição do WHERE é normalizada em CNF: cláusulas de tabela única
+    descem até a relação. Se restar alguma cláusula multi-tabela, a condição
+    original fica acima dos JOINs e os filtros de tabela única implicados por
+    ela (ex.: (A.x = 1 AND B.y = 2) OR A.x = 3 implica A.x = 1 OR A.x = 3)
+    também são aplicados antes dos JOINs.
     """
     # 1) Criar relações base
     base_rel = {tbl.lower(): Relation(tbl) for tbl in parsed_sql.get('from', [])}
 
-    # 2) Seleções de tabela única
+    # 2) Seleções de tabela única (diretas ou implicadas)
+    multi_table = []
     for cond_str in parsed_sql.get('where', []):
-        cond = Condition(cond_str)
-        tables = {col.split('.')[0].lower() for col in cond.columns}
-        if len(tables) == 1:
-            tbl = tables.pop()
-            if tbl in base_rel:
-                base_rel[tbl] = Selection(cond, base_rel[tbl])
+        pushed, residual = _pushdown_filters(cond_str)
+        for tbl, preds in pushed.items():
+            if tbl not in base_rel:
+                residual = True
+                continue
+            for pred in preds:
+                base_rel[tbl] = Selection(Condition(str(pred)), base_rel[tbl])
+        if residual:
+            multi_table.append(Condition(cond_str))
 
     # 3) Executar JOINs em ordem
     root = None
@@ -41,16 +62,39 @@ def build_ra_with_early_selection(parsed_sql):
             root = Join(root, base_rel[key], join_cond)
 
     # 4) Seleções multi-tabela
-    for cond_str in parsed_sql.get('where', []):
-        cond = Condition(cond_str)
-        tables = {col.split('.')[0].lower() for col in cond.columns}
-        if len(tables) > 1:
-            root = Selection(cond, root)
+    for cond in multi_table:
+        root = Selection(cond, root)
 
     # 5) Projeção final
     return Projection(parsed_sql.get('select', []), root)
 
 
+def _pushdown_filters(cond_str):
+    """
+    Filtros de tabela única extraídos de uma condição do WHERE.
+
+    Returns:
+        Tuple[dict, bool]: tabela (minúsculo) -> predicados a aplicar antes dos
+        JOINs, e se a condição original ainda precisa ficar acima deles
+    """
+    try:
+        pred = parse_predicate(cond_str.strip())
+    except PredicateParseError:
+        return {}, True
+    pushed, residual = {}, False
+    for clause in to_cnf(pred):
+        tables = predicate_tables(clause)
+        if len(tables) == 1 and '' not in tables:
+            pushed.setdefault(tables.pop(), []).append(clause)
+        else:
+            residual = True
+    if residual:
+        # O filtro implicado (via DNF) é mais forte que as cláusulas locais da CNF
+        for tbl, implied in implied_table_filters(pred).items():
+            pushed[tbl] = [implied]
+    return pushed, residual
+
+
 def push_projection_tree(expr):
     """
     Empurra a projeção final para baixo da árvore de joins e seleções.
@@ -63,9 +107,9 @@ def push_projection_tree(expr):
         # Base: relação
         if isinstance(node, Relation):
             return Projection(list(required), node)
-        # Seleção: mantém condição e empurra abaixo
+        # Seleção: mantém condição e empurra abaixo (com as colunas da condição)
         if isinstance(node, Selection):
-            inner = push(node.child, required)
+            inner = push(node.child, set(required) | set(node.condition.columns))
             return Selection(node.condition, inner)
         # Join: distribui atributos e chaves de junção
         if isinstance(node, Join):
@@ -108,6 +152,126 @@ def optimize_query(parsed_sql):
     return optimized, steps
 
 
+def flatten_joins(node):
+    """
+    Achata uma região de junções consecutivas.
+
+    Returns:
+        Tuple[list, list]: entradas (subárvores que não são Join), na ordem da
+        esquerda para a direita, e as condições de junção da região.
+    """
+    if not isinstance(node, Join):
+        return [node], []
+    left_inputs, left_conds = flatten_joins(node.left)
+    right_inputs, right_conds = flatten_joins(node.right)
+    return left_inputs + right_inputs, left_conds + right_conds + [node.condition]
+
+
+def _cond_tables(cond):
+    return {col.split('.')[0].lower() for col in cond.columns}
+
+
+def _connects(cond, left_tables, right_tables):
+    tables = _cond_tables(cond)
+    return bool(tables & left_tables and tables & right_tables)
+
+
+def _applicable(conds, left_tables, right_tables):
+    """
+    Condições que só usam tabelas disponíveis após a junção dos dois lados.
+    As que ligam os dois lados vêm primeiro (a primeira vira a condição da
+    junção); as de um lado só ou sem tabela são aplicadas como seleção.
+    """
+    available = left_tables | right_tables
+    usable = [c for c in conds if _cond_tables(c) <= available]
+    return sorted(usable, key=lambda c: not _connects(c, left_tables, right_tables))
+
+
+def _attach_leftovers(steps, pending):
+    """
+    Condições que nunca ficaram aplicáveis (tabela fora da região de junções)
+    vão para o último passo: nunca são descartadas, e a execução acusa a
+    coluna inexistente.
+    """
+    if pending and steps:
+        inp, conds = steps[-1]
+        steps[-1] = (inp, conds + pending)
+    return steps
+
+
+def assign_join_conditions(inputs, conditions):
+    """
+    Distribui as condições de junção pelas entradas na ordem dada: cada
+    condição fica no primeiro passo em que todas as suas tabelas estão
+    disponíveis, mesmo que não ligue os dois lados.
+
+    Returns:
+        list: passos (entrada, [condições]) a partir da segunda entrada
+    """
+    pending = list(conditions)
+    joined = _rel_names(inputs[0])
+    steps = []
+    for inp in inputs[1:]:
+        conds = _applicable(pending, joined, _rel_names(inp))
+        pending = [c for c in pending if c not in conds]
+        steps.append((inp, conds))
+        joined |= _rel_names(inp)
+    return _attach_leftovers(steps, pending)
+
+
+def build_join_tree(current, steps):
+    """Monta a árvore left-deep a partir de um nó inicial e dos passos de junção."""
+    for inp, conds in steps:
+        first = conds[0] if conds else Condition(CROSS_PRODUCT_CONDITION)
+        current = Join(current, inp, first)
+        for extra in conds[1:]:
+            current = Selection(extra, current)
+    return current
+
+
+def plan_join_order(current, inputs, conditions, stats):
+    """
+    Escolhe gulosamente a ordem das junções restantes pelo menor resultado
+    intermediário estimado, evitando produtos cartesianos quando possível.
+
+    Args:
+        current: subárvore já calculada (ou None para escolher a primeira entrada)
+        inputs: subárvores ainda não juntadas
+        conditions: condições de junção ainda não aplicadas
+        stats: StatisticsStore com as cardinalidades conhecidas/observadas
+
+    Returns:
+        Tuple[nó, list]: nó inicial e passos (entrada, [condições])
+    """
+    remaining = list(inputs)
+    pending = list(conditions)
+    if current is None:
+        current = min(remaining, key=lambda n: estimate_cardinality(n, stats))
+        remaining.remove(current)
+    start = current
+    joined = _rel_names(current)
+    rows = estimate_cardinality(current, stats)
+    steps = []
+    while remaining:
+        best = None
+        for inp in remaining:
+            conds = _applicable(pending, joined, _rel_names(inp))
+            est = rows * estimate_cardinality(inp, stats)
+            for c in conds:
+                est *= selectivity(c, stats)
+            # Junções conectadas sempre antes de produtos cartesianos
+            connected = any(_connects(c, joined, _rel_names(inp)) for c in conds)
+            key = (not connected, est)
+            if best is None or key < best[0]:
+                best = (key, inp, conds)
+        (_, rows), inp, conds = best
+        remaining.remove(inp)
+        pending = [c for c in pending if c not in conds]
+        joined |= _rel_names(inp)
+        steps.append((inp, conds))
+    return start, _attach_leftovers(steps, pending)
+
+
 def _rel_names(node):
     """Retorna o conjunto de nomes de todas as relações no subtree."""
     if isinstance(node, Relation):
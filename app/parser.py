@@ -7,6 +7,13 @@ from metadata import (
     get_correct_table_name,
     get_correct_column_name
 )
+from predicates import (
+    parse_predicate,
+    qualify_columns,
+    split_conjuncts,
+    split_top_level_and,
+    PredicateParseError
+)
 
 class SQLParseError(Exception):
     """Exceção para erros de parse do SQL"""
@@ -31,6 +38,7 @@ def parse_sql(sql_query):
     
     # 2) Normalizar espaços em branco
     sql = re.sub(r'\s+', ' ', sql).strip()
+    sql = sql.rstrip(';').strip()
     
     # 3) Deve começar com SELECT
     if not sql.lower().startswith('select '):
@@ -65,7 +73,7 @@ def parse_sql(sql_query):
             result['select'].append(col)
     
     # 5) Extrair cláusula FROM + JOINs
-    fj_match = re.search(r'from\s+(.*?)(?:where|$)', sql, re.IGNORECASE | re.DOTALL)
+    fj_match = re.search(r'from\s+(.*?)(?:\bwhere\b|$)', sql, re.IGNORECASE | re.DOTALL)
     if not fj_match:
         raise SQLParseError("Formato inválido: não foi possível analisar a cláusula FROM")
     fj_clause = fj_match.group(1).strip()
@@ -135,10 +143,50 @@ def parse_sql(sql_query):
             resolved_select.append(f"{default_table}.{c}")
     result['select'] = resolved_select
     
-    # 7) Extrair cláusula WHERE (simplificado, só AND)
-    where_match = re.search(r'where\s+(.*?)$', sql, re.IGNORECASE)
+    # 7) Extrair cláusula WHERE (expressão booleana: AND, OR, NOT, parênteses,
+    #    IN, BETWEEN, LIKE e IS NULL). Só os AND de nível superior viram
+    #    condições separadas; colunas sem tabela são qualificadas. Condições
+    #    fora da gramática são mantidas como texto (ficam acima dos JOINs).
+    where_match = re.search(r'\bwhere\s+(.*?)$', sql, re.IGNORECASE)
     if where_match:
-        raw_conds = re.split(r'\s+and\s+', where_match.group(1), flags=re.IGNORECASE)
-        result['where'] = [c.strip() for c in raw_conds]
+        where = where_match.group(1)
+        try:
+            conjuncts = split_conjuncts(parse_predicate(where))
+        except PredicateParseError:
+            conjuncts = split_top_level_and(where)
+        result['where'] = [
+            cond for c in conjuncts for cond in _where_conditions(c, result['from'])
+        ]
     
     return result
+
+def _where_conditions(conjunct, tables):
+    """Condições normalizadas de um trecho do WHERE (ou o texto original, se não reconhecido)."""
+    if isinstance(conjunct, str):
+        try:
+            conjunct = parse_predicate(conjunct)
+        except PredicateParseError:
+            return [conjunct]
+    qualified = qualify_columns(conjunct, lambda col: _qualify_column(col, tables))
+    return [str(c) for c in split_conjuncts(qualified)]
+
+def _qualify_column(col, tables):
+    """
+    Qualifica uma coluna do WHERE com a tabela do FROM/JOIN que a possui.
+    Se várias tabelas a possuírem, vale a tabela principal (como no SELECT).
+
+    Raises:
+        SQLParseError: se nenhuma ou mais de uma tabela tiver a coluna
+    """
+    if '.' in col:
+        return col
+    matches = [(tbl, get_correct_column_name(tbl, col)) for tbl in tables]
+    matches = [(tbl, c) for tbl, c in matches if c is not None]
+    if not matches:
+        raise SQLParseError(f"Coluna inválida: {col}")
+    if len(matches) > 1 and matches[0][0] == tables[0]:
+        matches = matches[:1]
+    if len(matches) > 1:
+        raise SQLParseError(f"Coluna ambígua: {col} ({', '.join(t for t, _ in matches)})")
+    tbl, c = matches[0]
+    return f"{tbl}.{c}"
@@ -0,0 +1,184 @@
+# plan_comparison.py
+# Comparação quantitativa entre a árvore de RA original e a otimizada
+
+from metadata import TABLES, get_correct_table_name
+from relational_algebra import Relation, Selection, Projection, Join
+from table_statistics import estimate_cardinality, default_statistics
+
+
+class OperatorEstimate:
+    """Estimativa de saída de um operador: tuplas, atributos e volume (tuplas x atributos)."""
+    def __init__(self, node, key, label, rows, width):
+        self.node = node
+        self.key = key
+        self.label = label
+        self.rows = rows
+        self.width = width
+        self.volume = rows * width
+
+    def __repr__(self):
+        return f"{self.label} (~{self.rows:.0f} tuplas, {self.width} atributos)"
+
+
+class PlanComparison:
+    """
+    Resultado da comparação entre dois planos com o mesmo modelo de custo.
+
+    O custo de um plano é o volume total lido e produzido: a soma de
+    tuplas x atributos da saída de cada operador. Uma projeção diretamente
+    sobre uma tabela base é a própria leitura da tabela (apenas as colunas
+    projetadas são lidas), então a tabela sob ela não é contada de novo.
+    """
+    def __init__(self, original, optimized):
+        self.original = original
+        self.optimized = optimized
+        self.original_cost = _plan_cost(original)
+        self.optimized_cost = _plan_cost(optimized)
+
+    @property
+    def improvement(self):
+        """Fração do custo original eliminada pela otimização (0 a 1)."""
+        if self.original_cost == 0:
+            return 0.0
+        return 1 - self.optimized_cost / self.original_cost
+
+    def _original_by_key(self):
+        original = {}
+        for op in self.original:
+            original.setdefault(op.key, op)
+        return original
+
+    def matched(self):
+        """
+        Operadores presentes nos dois planos (mesma tabela ou condição).
+
+        Returns:
+            list: tuplas (rótulo, tuplas no original, tuplas no otimizado)
+        """
+        original = self._original_by_key()
+        pairs = []
+        for op in self.optimized:
+            if op.key in original:
+                pairs.append((op.label, original[op.key].rows, op.rows))
+        return pairs
+
+    def shrunk_operators(self):
+        """Operadores do plano otimizado cuja saída diminuiu em relação ao original."""
+        original = self._original_by_key()
+        return [
+            op for op in self.optimized
+            if op.key in original and op.rows < original[op.key].rows
+        ]
+
+    def to_rows(self):
+        """Linhas (dicts) para exibição lado a lado."""
+        original = self._original_by_key()
+        rows = []
+        for op in self.optimized:
+            before = original.get(op.key)
+            rows.append({
+                'operador': op.label,
+                'tuplas_original': round(before.rows) if before else None,
+                'tuplas_otimizado': round(op.rows),
+                'atributos_original': before.width if before else None,
+                'atributos_otimizado': op.width,
+                'reduziu': bool(before and op.rows < before.rows),
+            })
+        return rows
+
+    def summary(self):
+        return {
+            'original_cost': self.original_cost,
+            'optimized_cost': self.optimized_cost,
+            'improvement': self.improvement,
+            'shrunk_operators': [op.label for op in self.shrunk_operators()],
+        }
+
+
+def _plan_cost(estimates):
+    # Relações lidas através de uma projeção já são contadas pela projeção
+    pruned = {
+        id(op.node.child) for op in estimates
+        if isinstance(op.node, Projection) and isinstance(op.node.child, Relation)
+    }
+    return sum(op.volume for op in estimates if id(op.node) not in pruned)
+
+
+def _normalize(condition):
+    return " ".join(str(condition).lower().split())
+
+
+def _operator_key(node):
+    if isinstance(node, Relation):
+        return ('relation', node.name.lower())
+    if isinstance(node, Selection):
+        return ('selection', _normalize(node.condition))
+    if isinstance(node, Join):
+        return ('join', _normalize(node.condition))
+    if isinstance(node, Projection):
+        return ('projection', tuple(sorted(a.lower() for a in node.attributes)))
+    return ('other', id(node))
+
+
+def _label(node):
+    if isinstance(node, Relation):
+        return node.name
+    if isinstance(node, Selection):
+        return f"σ {node.condition}"
+    if isinstance(node, Join):
+        return f"⋈ {node.condition}"
+    if isinstance(node, Projection):
+        return f"π {', '.join(node.attributes)}"
+    return str(node)
+
+
+def estimate_operators(tree, stats):
+    """
+    Estimativas de todos os operadores da árvore, em pós-ordem.
+
+    Returns:
+        list: OperatorEstimate de cada nó
+    """
+    estimates = []
+
+    def _walk(node):
+        if isinstance(node, Relation):
+            table = get_correct_table_name(node.name)
+            width = len(TABLES[table]) if table else 0
+        elif isinstance(node, Projection):
+            _walk(node.child)
+            width = len({a.lower() for a in node.attributes})
+        elif isinstance(node, Selection):
+            width = _walk(node.child)
+        elif isinstance(node, Join):
+            width = _walk(node.left) + _walk(node.right)
+        else:
+            return 0
+        estimates.append(OperatorEstimate(
+            node, _operator_key(node), _label(node),
+            estimate_cardinality(node, stats), width
+        ))
+        return width
+
+    _walk(tree)
+    return estimates
+
+
+def compare_plans(original_tree, optimized_tree, stats=None):
+    """
+    Estima os dois planos com o mesmo modelo de custo e os compara.
+
+    Args:
+        original_tree: árvore de ast_to_relational_algebra (sem otimização)
+        optimized_tree: árvore de optimize_query
+        stats (StatisticsStore, opcional): padrão são os dados sintéticos (SF 1)
+
+    Returns:
+        PlanComparison
+    """
+    if stats is None:
+        stats = default_statistics()
+    return PlanComparison(
+        estimate_operators(original_tree, stats),
+        estimate_operators(optimized_tree, stats)
+    )
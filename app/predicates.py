@@ -0,0 +1,639 @@
+# predicates.py
+# Parser e normalização de predicados booleanos (AND, OR, NOT, IN, BETWEEN, LIKE, IS NULL)
+
+import operator
+import re
+from functools import lru_cache
+
+# Limite de termos ao converter para CNF/DNF (evita explosão exponencial)
+MAX_NORMAL_FORM_TERMS = 64
+
+
+class PredicateParseError(Exception):
+    """Exceção para erros de sintaxe em predicados"""
+    pass
+
+
+_OPERATORS = {
+    '=':  operator.eq,
+    '!=': operator.ne,
+    '<>': operator.ne,
+    '<':  operator.lt,
+    '<=': operator.le,
+    '>':  operator.gt,
+    '>=': operator.ge,
+}
+
+# Operador equivalente à negação de cada comparação
+_NEGATED = {'=': '<>', '!=': '=', '<>': '=', '<': '>=', '<=': '>', '>': '<=', '>=': '<'}
+
+
+def _format_operand(operand):
+    kind, value = operand
+    if kind == 'lit' and isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if kind == 'lit' and (value is None or isinstance(value, bool)):
+        return {None: 'NULL', True: 'TRUE', False: 'FALSE'}[value]
+    return str(value)
+
+
+def _numeric(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _table_of(ref):
+    # Colunas não qualificadas ficam com tabela '' (desconhecida)
+    return ref.split('.', 1)[0].lower() if '.' in ref else ''
+
+
+class Comparison:
+    """Comparação 'a op b'; cada operando é ('col', referência) ou ('lit', valor)."""
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+
+    def columns(self):
+        return [v for kind, v in (self.left, self.right) if kind == 'col']
+
+    def negate(self):
+        return Comparison(self.left, _NEGATED[self.op], self.right)
+
+    def __str__(self):
+        return f"{_format_operand(self.left)} {self.op} {_format_operand(self.right)}"
+
+
+class InList:
+    """Teste de pertinência 'coluna [NOT] IN (v1, v2, ...)', avaliado com hash set."""
+    def __init__(self, column, values, negated=False):
+        self.column = column
+        self.values = list(values)
+        self.value_set = frozenset(self.values)
+        self.numeric_set = frozenset(_numeric(v) for v in self.values if isinstance(v, str)) - {None}
+        # NULL na lista: nunca casa com IN e torna NOT IN desconhecido (falso) para toda tupla
+        self.has_null = None in self.value_set
+        self.negated = negated
+
+    def columns(self):
+        return [self.column]
+
+    def negate(self):
+        return InList(self.column, self.values, not self.negated)
+
+    def __str__(self):
+        values = ", ".join(_format_operand(('lit', v)) for v in self.values)
+        return f"{self.column} {'NOT IN' if self.negated else 'IN'} ({values})"
+
+
+class Like:
+    """Casamento de padrão 'coluna [NOT] LIKE padrão' (% = qualquer sequência, _ = um caractere)."""
+    def __init__(self, column, pattern, negated=False):
+        self.column = column
+        self.pattern = pattern
+        self.negated = negated
+        regex = ''.join(
+            '.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in pattern
+        )
+        self.regex = re.compile(regex, re.DOTALL)
+
+    def columns(self):
+        return [self.column]
+
+    def negate(self):
+        return Like(self.column, self.pattern, not self.negated)
+
+    def __str__(self):
+        op = 'NOT LIKE' if self.negated else 'LIKE'
+        return f"{self.column} {op} {_format_operand(('lit', self.pattern))}"
+
+
+class IsNull:
+    """Teste 'coluna IS [NOT] NULL'."""
+    def __init__(self, column, negated=False):
+        self.column = column
+        self.negated = negated
+
+    def columns(self):
+        return [self.column]
+
+    def negate(self):
+        return IsNull(self.column, not self.negated)
+
+    def __str__(self):
+        return f"{self.column} IS {'NOT NULL' if self.negated else 'NULL'}"
+
+
+class Constant:
+    """Predicado constante (TRUE ou FALSE)."""
+    def __init__(self, value):
+        self.value = bool(value)
+
+    def columns(self):
+        return []
+
+    def negate(self):
+        return Constant(not self.value)
+
+    def __str__(self):
+        return 'TRUE' if self.value else 'FALSE'
+
+
+class And:
+    def __init__(self, items):
+        self.items = list(items)
+
+    def columns(self):
+        return [c for item in self.items for c in item.columns()]
+
+    def __str__(self):
+        return " AND ".join(f"({i})" if isinstance(i, Or) else str(i) for i in self.items)
+
+
+class Or:
+    def __init__(self, items):
+        self.items = list(items)
+
+    def columns(self):
+        return [c for item in self.items for c in item.columns()]
+
+    def __str__(self):
+        return " OR ".join(f"({i})" if isinstance(i, And) else str(i) for i in self.items)
+
+
+class Not:
+    def __init__(self, item):
+        self.item = item
+
+    def columns(self):
+        return self.item.columns()
+
+    def __str__(self):
+        return f"NOT ({self.item})"
+
+
+def predicate_tables(node):
+    """Tabelas (minúsculo) referenciadas pelo predicado; '' indica coluna não qualificada."""
+    return {_table_of(c) for c in node.columns()}
+
+
+# --- Parser ---
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<string>'(?:[^']|'')*'|"(?:[^"]|"")*")
+    | (?P<number>-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)(?![\w.])
+    | (?P<op><=|>=|<>|!=|=|<|>)
+    | (?P<punct>[(),])
+    | (?P<ident>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)?)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {'and', 'or', 'not', 'in', 'between', 'like', 'is', 'null', 'true', 'false'}
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise PredicateParseError(f"Símbolo inesperado em '{text[pos:].strip()}'")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == 'ident' and value.lower() in _KEYWORDS:
+            kind, value = 'kw', value.lower()
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self, kind=None, value=None):
+        if self.pos >= len(self.tokens):
+            return None
+        tok = self.tokens[self.pos]
+        if kind and tok[0] != kind:
+            return None
+        if value and tok[1] != value:
+            return None
+        return tok
+
+    def take(self, kind=None, value=None):
+        tok = self.peek(kind, value)
+        if tok is None:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else 'fim'
+            expected = value or kind
+            raise PredicateParseError(f"Esperado '{expected}', encontrado '{found}' em: {self.text}")
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        node = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise PredicateParseError(f"Símbolo inesperado '{self.tokens[self.pos][1]}' em: {self.text}")
+        return node
+
+    def parse_or(self):
+        items = [self.parse_and()]
+        while self.peek('kw', 'or'):
+            self.take()
+            items.append(self.parse_and())
+        return items[0] if len(items) == 1 else Or(items)
+
+    def parse_and(self):
+        items = [self.parse_not()]
+        while self.peek('kw', 'and'):
+            self.take()
+            items.append(self.parse_not())
+        return items[0] if len(items) == 1 else And(items)
+
+    def parse_not(self):
+        if self.peek('kw', 'not'):
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        if self.peek('punct', '('):
+            self.take()
+            node = self.parse_or()
+            self.take('punct', ')')
+            return node
+        left = self.parse_operand()
+        if self.peek('op'):
+            op = self.take()[1]
+            return Comparison(left, op, self.parse_operand())
+        if self.peek('kw', 'is'):
+            self.take()
+            negated = False
+            if self.peek('kw', 'not'):
+                self.take()
+                negated = True
+            self.take('kw', 'null')
+            return IsNull(self._column(left, 'IS NULL'), negated)
+        if left[0] == 'lit' and isinstance(left[1], bool):
+            return Constant(left[1])
+        negated = False
+        if self.peek('kw', 'not'):
+            self.take()
+            negated = True
+        if self.peek('kw', 'like'):
+            self.take()
+            pattern = self.parse_literal()
+            if not isinstance(pattern, str):
+                raise PredicateParseError(f"LIKE exige um padrão de texto em: {self.text}")
+            return Like(self._column(left, 'LIKE'), pattern, negated)
+        if self.peek('kw', 'in'):
+            self.take()
+            self._column(left, 'IN')
+            self.take('punct', '(')
+            values = [self.parse_literal()]
+            while self.peek('punct', ','):
+                self.take()
+                values.append(self.parse_literal())
+            self.take('punct', ')')
+            return InList(left[1], values, negated)
+        if self.peek('kw', 'between'):
+            self.take()
+            low = self.parse_operand()
+            self.take('kw', 'and')
+            high = self.parse_operand()
+            node = And([Comparison(left, '>=', low), Comparison(left, '<=', high)])
+            return Not(node) if negated else node
+        raise PredicateParseError(f"Comparação incompleta em: {self.text}")
+
+    def parse_operand(self):
+        if self.peek('ident'):
+            return ('col', self.take()[1])
+        return ('lit', self.parse_literal())
+
+    def _column(self, operand, construct):
+        if operand[0] != 'col':
+            raise PredicateParseError(f"{construct} exige uma coluna à esquerda em: {self.text}")
+        return operand[1]
+
+    def parse_literal(self):
+        if self.peek('string'):
+            text = self.take()[1]
+            quote = text[0]
+            return text[1:-1].replace(quote * 2, quote)
+        if self.peek('number'):
+            text = self.take()[1]
+            return float(text) if any(ch in text for ch in '.eE') else int(text)
+        for keyword, value in (('true', True), ('false', False), ('null', None)):
+            if self.peek('kw', keyword):
+                self.take()
+                return value
+        found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else 'fim'
+        raise PredicateParseError(f"Valor esperado, encontrado '{found}' em: {self.text}")
+
+
+@lru_cache(maxsize=4096)
+def parse_predicate(text):
+    """
+    Converte o texto de uma condição em uma árvore de predicados.
+
+    Os nós retornados são compartilhados (cache) e não devem ser alterados.
+
+    Raises:
+        PredicateParseError: se a condição não puder ser analisada
+    """
+    return _Parser(str(text)).parse()
+
+
+def split_top_level_and(text):
+    """
+    Divide o texto de uma condição nos AND de nível superior sem analisá-lo
+    (fora de aspas e parênteses; o AND de um BETWEEN não conta). Usado quando
+    a condição não é reconhecida pela gramática de parse_predicate.
+    """
+    parts, depth, quote, start = [], 0, None, 0
+    pending_between = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0 and (i == 0 or not (text[i - 1].isalnum() or text[i - 1] in '_.')):
+            m = re.match(r'(between|and)\b', text[i:], re.IGNORECASE)
+            if m and m.group(1).lower() == 'between':
+                pending_between = True
+            elif m and pending_between:
+                pending_between = False
+            elif m:
+                parts.append(text[start:i].strip())
+                start = i + len(m.group(1))
+            if m:
+                i += len(m.group(1))
+                continue
+        i += 1
+    parts.append(text[start:].strip())
+    return [p for p in parts if p]
+
+
+def split_conjuncts(node):
+    """Conjunções de nível superior (sem normalizar)."""
+    if isinstance(node, And):
+        return [c for item in node.items for c in split_conjuncts(item)]
+    return [node]
+
+
+def qualify_columns(node, resolve):
+    """Nova árvore com cada coluna substituída por resolve(referência)."""
+    if isinstance(node, Comparison):
+        left, right = node.left, node.right
+        if left[0] == 'col':
+            left = ('col', resolve(left[1]))
+        if right[0] == 'col':
+            right = ('col', resolve(right[1]))
+        return Comparison(left, node.op, right)
+    if isinstance(node, InList):
+        return InList(resolve(node.column), node.values, node.negated)
+    if isinstance(node, Like):
+        return Like(resolve(node.column), node.pattern, node.negated)
+    if isinstance(node, IsNull):
+        return IsNull(resolve(node.column), node.negated)
+    if isinstance(node, Constant):
+        return node
+    if isinstance(node, Not):
+        return Not(qualify_columns(node.item, resolve))
+    return type(node)([qualify_columns(item, resolve) for item in node.items])
+
+
+# --- Normalização (NNF, CNF e DNF) ---
+
+class _TooLarge(Exception):
+    pass
+
+
+def to_nnf(node, negate=False):
+    """Forma normal negada: NOT apenas empurrado até as comparações."""
+    if isinstance(node, Not):
+        return to_nnf(node.item, not negate)
+    if isinstance(node, (And, Or)):
+        items = [to_nnf(item, negate) for item in node.items]
+        flip = isinstance(node, And) == negate
+        return Or(items) if flip else And(items)
+    return node.negate() if negate else node
+
+
+def _normal_form(node, outer):
+    """Lista de termos (listas de literais) com outer = And (CNF) ou Or (DNF)."""
+    if isinstance(node, outer):
+        terms = []
+        for item in node.items:
+            terms.extend(_normal_form(item, outer))
+        return terms
+    if isinstance(node, (And, Or)):
+        terms = [[]]
+        for item in node.items:
+            sub = _normal_form(item, outer)
+            terms = [a + b for a in terms for b in sub]
+            if len(terms) > MAX_NORMAL_FORM_TERMS:
+                raise _TooLarge()
+        return terms
+    return [[node]]
+
+
+def _absorb(terms):
+    """
+    Remove literais repetidos, termos repetidos e termos que contêm outro
+    termo (absorção: a OR (a AND b) = a; a AND (a OR b) = a). Mantém a ordem.
+    """
+    keyed = []
+    for term in terms:
+        unique = {str(lit): lit for lit in term}
+        keyed.append((frozenset(unique), list(unique.values())))
+    kept = []
+    for i, (keys, lits) in enumerate(keyed):
+        absorbed = any(
+            other < keys or (other == keys and j < i)
+            for j, (other, _) in enumerate(keyed) if j != i
+        )
+        if not absorbed:
+            kept.append(lits)
+    return kept
+
+
+def _build(terms, outer):
+    inner = Or if outer is And else And
+    return [
+        lits[0] if len(lits) == 1 else inner(lits)
+        for lits in _absorb(terms)
+    ]
+
+
+def to_cnf(node):
+    """
+    Cláusulas da forma normal conjuntiva (cada uma é um literal ou um Or).
+    Se a conversão for grande demais, devolve o predicado inteiro como cláusula única.
+    """
+    try:
+        return _build(_normal_form(to_nnf(node), And), And)
+    except _TooLarge:
+        return [node]
+
+
+def to_dnf(node):
+    """Termos da forma normal disjuntiva (cada um é um literal ou um And), ou None se grande demais."""
+    try:
+        return _build(_normal_form(to_nnf(node), Or), Or)
+    except _TooLarge:
+        return None
+
+
+def implied_table_filters(node):
+    """
+    Filtros de tabela única implicados por um predicado multi-tabela.
+
+    Para cada tabela T, se todo termo da DNF contém ao menos um literal que só
+    usa T, a disjunção desses literais é implicada pelo predicado e pode ser
+    aplicada a T antes das junções (o predicado original continua acima).
+
+    Returns:
+        dict: tabela (minúsculo) -> predicado
+    """
+    tables = predicate_tables(node)
+    if len(tables) < 2 or '' in tables:
+        return {}
+    try:
+        terms = _normal_form(to_nnf(node), Or)
+    except _TooLarge:
+        return {}
+    implied = {}
+    for table in tables:
+        parts = []
+        for term in terms:
+            local = [lit for lit in term if predicate_tables(lit) == {table}]
+            if not local:
+                break
+            parts.append(local)
+        else:
+            built = _build(parts, Or)
+            implied[table] = built[0] if len(built) == 1 else Or(built)
+    return implied
+
+
+# --- Avaliação ---
+
+def _compare(a, op, b):
+    if a is None or b is None:
+        return False
+    # Coerção simples entre texto e número
+    if isinstance(a, str) != isinstance(b, str):
+        try:
+            if isinstance(a, str):
+                a = float(a)
+            else:
+                b = float(b)
+        except ValueError:
+            return op is operator.ne
+    try:
+        return op(a, b)
+    except TypeError:
+        return False
+
+
+def _getter(operand, batch):
+    kind, value = operand
+    if kind == 'col':
+        return batch.column(value).__getitem__
+    return lambda i: value
+
+
+def evaluate(node, batch, positions=None):
+    """
+    Posições das tuplas de batch que satisfazem o predicado.
+
+    Os conectivos trabalham sobre listas de posições: AND filtra
+    progressivamente, OR avalia cada ramo só nas posições ainda não aceitas
+    (igualdades sobre a mesma coluna viram um único teste em hash set).
+    """
+    if positions is None:
+        positions = range(batch.size)
+    if isinstance(node, Comparison):
+        left, right = _getter(node.left, batch), _getter(node.right, batch)
+        fn = _OPERATORS[node.op]
+        return [i for i in positions if _compare(left(i), fn, right(i))]
+    if isinstance(node, InList):
+        values = batch.column(node.column)
+        if node.negated:
+            if node.has_null:
+                return []
+            return [i for i in positions if values[i] is not None and not _member(values[i], node)]
+        return [i for i in positions if _member(values[i], node)]
+    if isinstance(node, Like):
+        values = batch.column(node.column)
+        match = node.regex.fullmatch
+        return [
+            i for i in positions
+            if values[i] is not None and (match(str(values[i])) is None) == node.negated
+        ]
+    if isinstance(node, IsNull):
+        values = batch.column(node.column)
+        return [i for i in positions if (values[i] is None) != node.negated]
+    if isinstance(node, Constant):
+        return list(positions) if node.value else []
+    if isinstance(node, And):
+        for item in node.items:
+            positions = evaluate(item, batch, positions)
+        return list(positions)
+    if isinstance(node, Or):
+        accepted = set()
+        remaining = positions
+        for item in _fold_equalities(node.items):
+            accepted.update(evaluate(item, batch, remaining))
+            remaining = [i for i in remaining if i not in accepted]
+        return [i for i in positions if i in accepted]
+    if isinstance(node, Not):
+        # NOT empurrado até as comparações: valores nulos continuam rejeitados
+        return evaluate(to_nnf(node.item, negate=True), batch, positions)
+    raise PredicateParseError(f"Predicado não suportado: {node!r}")
+
+
+def _fold_equalities(items):
+    """
+    Agrupa 'col = literal' de uma mesma coluna em um único InList (hash set).
+    Igualdades com NULL não são agrupadas (nunca são verdadeiras).
+    """
+    groups = {}
+    rest = []
+    for item in items:
+        if isinstance(item, Comparison) and item.op == '=' and {item.left[0], item.right[0]} == {'col', 'lit'}:
+            col, lit = (item.left, item.right) if item.left[0] == 'col' else (item.right, item.left)
+            if lit[1] is None:
+                rest.append(item)
+                continue
+            groups.setdefault(col[1], []).append(lit[1])
+        else:
+            rest.append(item)
+    folded = [InList(col, values) for col, values in groups.items()]
+    return folded + rest
+
+
+def _member(value, node):
+    # NULL nunca é membro (nem de uma lista que contém NULL)
+    if value is None:
+        return False
+    if value in node.value_set:
+        return True
+    # Coerção entre texto e número, como em _compare
+    if isinstance(value, str):
+        number = _numeric(value)
+        return number is not None and number in node.value_set
+    return value in node.numeric_set
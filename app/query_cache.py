@@ -0,0 +1,188 @@
+# query_cache.py
+# Cache compartilhado (por processo) de consultas processadas
+
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from parser import parse_sql
+from relational_algebra import ast_to_relational_algebra
+from optimizer import optimize_query
+from graph_generator import generate_operator_graph
+from execution_plan import get_execution_steps
+from plan_comparison import compare_plans
+
+# Limite padrão de memória do cache (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(obj, _seen=None):
+    """Estimativa (recursiva) da memória ocupada por um objeto, em bytes."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), _seen)
+    return size
+
+
+class QueryCache:
+    """
+    Cache LRU thread-safe com contabilidade de memória.
+
+    As entradas são identificadas por (tipo, chave) e removidas da menos
+    recentemente usada para a mais recente quando o total ultrapassa
+    max_bytes. Os valores são compartilhados entre sessões e não devem ser
+    alterados por quem os lê.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()   # (tipo, chave) -> (valor, tamanho)
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    def get(self, kind, key):
+        with self._lock:
+            entry = self._touch(kind, key)
+            if entry is None:
+                self.misses += 1
+                return None
+            return entry[0]
+
+    def put(self, kind, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop((kind, key), None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[(kind, key)] = (value, size)
+            self.total_bytes += size
+            self._evict()
+        return value
+
+    def get_or_compute(self, kind, key, compute):
+        """
+        Retorna o valor em cache ou o calcula uma única vez, mesmo com várias
+        sessões pedindo a mesma chave ao mesmo tempo. Só quem calcula conta
+        como miss; quem esperou o cálculo de outra thread conta como hit.
+        """
+        with self._lock:
+            entry = self._touch(kind, key)
+            if entry is not None:
+                return entry[0]
+            key_lock = self._key_locks.setdefault((kind, key), threading.Lock())
+        with key_lock:
+            # Outra thread pode ter calculado enquanto esperávamos
+            with self._lock:
+                entry = self._touch(kind, key)
+                if entry is not None:
+                    return entry[0]
+                self.misses += 1
+            try:
+                return self.put(kind, key, compute())
+            finally:
+                with self._lock:
+                    self._key_locks.pop((kind, key), None)
+
+    def _touch(self, kind, key):
+        # Chamado com _lock: conta o hit e marca a entrada como recente
+        entry = self._entries.get((kind, key))
+        if entry is not None:
+            self._entries.move_to_end((kind, key))
+            self.hits += 1
+        return entry
+
+    def _evict(self):
+        # Mantém ao menos a entrada mais recente, mesmo que sozinha exceda o limite
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def query_key(sql_query):
+    """Chave estável de uma consulta (espaços e ';' final normalizados)."""
+    sql = re.sub(r'\s+', ' ', sql_query).strip().rstrip(';').strip()
+    return hashlib.sha1(sql.encode('utf-8')).hexdigest()
+
+
+def _render_graph(original_tree, optimized_tree, comparison):
+    # Arquivo exclusivo por renderização: sessões concorrentes não se sobrescrevem
+    fd, path = tempfile.mkstemp(suffix='.png', prefix='operator_graph_')
+    os.close(fd)
+    try:
+        G, _ = generate_operator_graph(original_tree, optimized_tree, path, comparison)
+        with open(path, 'rb') as f:
+            return G, f.read()
+    finally:
+        os.remove(path)
+
+
+def process_query(cache, sql_query):
+    """
+    Executa o pipeline completo (parse, RA, otimização, grafo, plano e
+    comparação de custos), reaproveitando do cache cada etapa já calculada
+    por qualquer sessão.
+
+    Raises:
+        SQLParseError: se a consulta for inválida (erros não são guardados)
+
+    Returns:
+        dict: chave da consulta e artefatos de cada etapa
+    """
+    key = query_key(sql_query)
+    parsed = cache.get_or_compute('parsed', key, lambda: parse_sql(sql_query))
+    original = cache.get_or_compute('original', key, lambda: ast_to_relational_algebra(parsed))
+    optimized, steps = cache.get_or_compute('optimized', key, lambda: optimize_query(parsed))
+    # Comparação calculada uma vez e repassada ao grafo e ao plano
+    comparison = cache.get_or_compute('comparison', key, lambda: compare_plans(original, optimized))
+    graph, image = cache.get_or_compute(
+        'graph', key, lambda: _render_graph(original, optimized, comparison)
+    )
+    plan = cache.get_or_compute(
+        'plan', key, lambda: get_execution_steps(original, optimized, graph, steps, comparison)
+    )
+    return {
+        'key': key,
+        'parsed': parsed,
+        'original': original,
+        'optimized': optimized,
+        'steps': steps,
+        'graph': graph,
+        'image': image,
+        'plan': plan,
+        'comparison': comparison,
+    }
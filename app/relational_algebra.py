@@ -2,6 +2,7 @@
 # Definição de classes para árvore de Álgebra Relacional e conversão de AST
 
 import re
+from predicates import parse_predicate, PredicateParseError
 
 class Relation:
     def __init__(self, name):
@@ -17,8 +18,12 @@ class Relation:
 class Condition:
     def __init__(self, expr: str):
         self.expr = expr
-        # Extrai colunas qualificadas no formato tabela.coluna
-        self.columns = re.findall(r'\b\w+\.\w+\b', expr)
+        # Extrai colunas qualificadas no formato tabela.coluna (literais são ignorados)
+        try:
+            refs = parse_predicate(expr.strip()).columns()
+            self.columns = list(dict.fromkeys(c for c in refs if '.' in c))
+        except PredicateParseError:
+            self.columns = re.findall(r'\b\w+\.\w+\b', expr)
 
     def __str__(self):
         return self.expr
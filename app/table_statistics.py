@@ -0,0 +1,298 @@
+# table_statistics.py
+# Estatísticas das tabelas e estimativa de cardinalidade para árvores de RA
+
+import heapq
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from relational_algebra import Relation, Selection, Projection, Join
+from predicates import (
+    parse_predicate,
+    Comparison,
+    InList,
+    Like,
+    IsNull,
+    Constant,
+    And,
+    Or,
+    Not,
+    PredicateParseError
+)
+from data_generator import generate_database
+
+# Valores padrão quando não há estatística disponível
+DEFAULT_TABLE_ROWS = 1000
+DEFAULT_DISTINCT = 10
+DEFAULT_SELECTIVITY = 0.1
+RANGE_SELECTIVITY = 1 / 3
+# Quantos bancos em memória têm estatísticas mantidas por database_statistics()
+MAX_TRACKED_DATABASES = 8
+# Hashes guardados por coluna para estimar valores distintos (erro ~ 1/sqrt(k))
+DISTINCT_SKETCH_SIZE = 1024
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value):
+    """Espalha hash(value) uniformemente em 64 bits (finalizador do splitmix64)."""
+    h = hash(value) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+
+class DistinctSketch:
+    """
+    Contador aproximado de valores distintos (k menores hashes, KMV).
+
+    Guarda no máximo k hashes por coluna em vez de todos os valores: até k
+    distintos a contagem é exata; acima disso é uma estimativa com erro
+    relativo em torno de 1/sqrt(k).
+    """
+    def __init__(self, k=DISTINCT_SKETCH_SIZE):
+        self.k = k
+        self._heap = []      # -hash: o topo é o maior dos k menores hashes
+        self._hashes = set()
+
+    def update(self, values):
+        heap, hashes, k = self._heap, self._hashes, self.k
+        for value in set(values):
+            h = _mix64(value)
+            if h in hashes:
+                continue
+            if len(heap) < k:
+                heapq.heappush(heap, -h)
+                hashes.add(h)
+            elif h < -heap[0]:
+                hashes.discard(-heapq.heappushpop(heap, -h))
+                hashes.add(h)
+
+    def estimate(self):
+        if len(self._heap) < self.k:
+            return len(self._heap)
+        kth = -self._heap[0]
+        return round((self.k - 1) * (1 << 64) / (kth + 1))
+
+
+class StatisticsStore:
+    """
+    Repositório de estatísticas usado pelo otimizador e pelo executor.
+
+    row_counts: tabela (minúsculo) -> número de tuplas
+    distinct:   'tabela.coluna' (minúsculo) -> número de valores distintos
+    observed:   assinatura lógica de uma subárvore -> cardinalidade observada
+
+    Os valores distintos vêm de um DistinctSketch por coluna: a memória fica
+    limitada a DISTINCT_SKETCH_SIZE hashes por coluna (em vez de uma cópia
+    dos valores), ao custo de contagens aproximadas acima desse limite.
+    """
+    def __init__(self):
+        self.row_counts = {}
+        self.distinct = {}
+        self.observed = {}
+        # Coleta incremental: tuplas já lidas por tabela e sketch por coluna
+        self._collected = {}
+        self._sketches = {}
+
+    @classmethod
+    def from_database(cls, database):
+        """Coleta contagens e valores distintos de um banco em memória."""
+        stats = cls()
+        stats.refresh(database)
+        return stats
+
+    def refresh(self, database):
+        """
+        Atualiza contagens e valores distintos lendo apenas as tuplas
+        acrescentadas desde a última coleta. Observações de subárvores que
+        usam tabelas alteradas são descartadas.
+        """
+        changed = set()
+        for table, columns in database.items():
+            t = table.lower()
+            size = len(next(iter(columns.values()))) if columns else 0
+            start = self._collected.get(t, 0)
+            if size == start and t in self.row_counts:
+                continue
+            if size < start:
+                # Tabela substituída ou truncada: coleta de novo
+                start = 0
+            for col, values in columns.items():
+                key = f"{t}.{col.lower()}"
+                sketch = self._sketches.get(key) if start else None
+                if sketch is None:
+                    sketch = self._sketches[key] = DistinctSketch()
+                sketch.update(islice(values, start, None))
+                self.distinct[key] = sketch.estimate()
+            self._collected[t] = size
+            self.row_counts[t] = size
+            changed.add(t)
+        if changed and self.observed:
+            self.observed = {
+                sig: rows for sig, rows in self.observed.items() if not sig[0] & changed
+            }
+
+    def table_rows(self, table):
+        return self.row_counts.get(table.lower(), DEFAULT_TABLE_ROWS)
+
+    def distinct_values(self, column):
+        key = column.strip().lower()
+        if key in self.distinct:
+            return max(self.distinct[key], 1)
+        if '.' not in key:
+            matches = [v for k, v in self.distinct.items() if k.split('.', 1)[1] == key]
+            if len(matches) == 1:
+                return max(matches[0], 1)
+        return DEFAULT_DISTINCT
+
+    def observed_rows(self, node):
+        return self.observed.get(signature(node))
+
+    def record(self, node, rows):
+        """Registra a cardinalidade real observada para uma subárvore."""
+        self.observed[signature(node)] = rows
+        if isinstance(node, Relation):
+            self.row_counts[node.name.lower()] = rows
+
+
+@lru_cache(maxsize=1)
+def default_statistics():
+    """
+    Estatísticas de referência (dados sintéticos com fator de escala 1),
+    usadas quando não há um banco real disponível. Calculadas uma vez por
+    processo e compartilhadas: não registre observações nelas.
+    """
+    return StatisticsStore.from_database(generate_database(1.0))
+
+
+_DATABASE_STATISTICS = OrderedDict()   # id(banco) -> (banco, StatisticsStore)
+
+
+def database_statistics(database):
+    """
+    Estatísticas de longa duração de um banco em memória, compartilhadas
+    entre execuções: criadas na primeira chamada e depois apenas atualizadas
+    com as tuplas novas (refresh). As cardinalidades observadas pela execução
+    adaptativa ficam registradas para as próximas consultas.
+
+    Os bancos são dicts comuns, que não aceitam weakref: o registro guarda
+    referências fortes aos MAX_TRACKED_DATABASES bancos mais recentes (LRU).
+    O custo extra por banco é limitado pelos sketches de valores distintos,
+    não proporcional aos dados.
+    """
+    entry = _DATABASE_STATISTICS.get(id(database))
+    if entry is None or entry[0] is not database:
+        entry = (database, StatisticsStore.from_database(database))
+        _DATABASE_STATISTICS[id(database)] = entry
+        while len(_DATABASE_STATISTICS) > MAX_TRACKED_DATABASES:
+            _DATABASE_STATISTICS.popitem(last=False)
+    else:
+        _DATABASE_STATISTICS.move_to_end(id(database))
+        entry[1].refresh(database)
+    return entry[1]
+
+
+def signature(node):
+    """
+    Assinatura lógica de uma subárvore: conjunto de tabelas e de predicados.
+
+    Projeções e a ordem das junções não alteram a cardinalidade, então
+    subárvores equivalentes compartilham a mesma assinatura.
+    """
+    return frozenset(_tables(node)), frozenset(_predicates(node))
+
+
+def _tables(node):
+    if isinstance(node, Relation):
+        return {node.name.lower()}
+    if isinstance(node, Join):
+        return _tables(node.left) | _tables(node.right)
+    if hasattr(node, 'child'):
+        return _tables(node.child)
+    return set()
+
+
+def _predicates(node):
+    if isinstance(node, Selection):
+        return {_normalize(node.condition)} | _predicates(node.child)
+    if isinstance(node, Join):
+        return {_normalize(node.condition)} | _predicates(node.left) | _predicates(node.right)
+    if hasattr(node, 'child'):
+        return _predicates(node.child)
+    return set()
+
+
+def _normalize(condition):
+    return " ".join(str(condition).lower().split())
+
+
+def selectivity(condition, stats):
+    """
+    Fator de seletividade estimado para uma condição.
+
+    AND multiplica os fatores (independência), OR usa 1 - Π(1 - s),
+    NOT usa 1 - s e IN usa (tamanho da lista) / (valores distintos).
+    LIKE e IS NULL usam o fator padrão.
+    """
+    try:
+        pred = parse_predicate(str(condition).strip())
+    except PredicateParseError:
+        return DEFAULT_SELECTIVITY
+    return _predicate_selectivity(pred, stats)
+
+
+def _predicate_selectivity(node, stats):
+    if isinstance(node, And):
+        result = 1.0
+        for item in node.items:
+            result *= _predicate_selectivity(item, stats)
+        return result
+    if isinstance(node, Or):
+        miss = 1.0
+        for item in node.items:
+            miss *= 1.0 - _predicate_selectivity(item, stats)
+        return 1.0 - miss
+    if isinstance(node, Not):
+        return 1.0 - _predicate_selectivity(node.item, stats)
+    if isinstance(node, InList):
+        if node.negated and node.has_null:
+            return 0.0
+        hit = min(1.0, len(node.value_set) / stats.distinct_values(node.column))
+        return 1.0 - hit if node.negated else hit
+    if isinstance(node, Constant):
+        return 1.0 if node.value else 0.0
+    if isinstance(node, (Like, IsNull)):
+        return 1.0 - DEFAULT_SELECTIVITY if node.negated else DEFAULT_SELECTIVITY
+    if isinstance(node, Comparison):
+        cols = node.columns()
+        if not cols:
+            return 1.0
+        if node.op == '=':
+            return 1.0 / max(stats.distinct_values(c) for c in cols)
+        if node.op in ('!=', '<>'):
+            return 1.0 - 1.0 / max(stats.distinct_values(c) for c in cols)
+        return RANGE_SELECTIVITY
+    return DEFAULT_SELECTIVITY
+
+
+def estimate_cardinality(node, stats):
+    """
+    Estima o número de tuplas produzidas por um nó da árvore de RA.
+
+    Cardinalidades já observadas (mesma assinatura) têm prioridade sobre a
+    estimativa calculada.
+    """
+    observed = stats.observed_rows(node)
+    if observed is not None:
+        return observed
+    if isinstance(node, Relation):
+        return stats.table_rows(node.name)
+    if isinstance(node, Projection):
+        return estimate_cardinality(node.child, stats)
+    if isinstance(node, Selection):
+        return estimate_cardinality(node.child, stats) * selectivity(node.condition, stats)
+    if isinstance(node, Join):
+        left = estimate_cardinality(node.left, stats)
+        right = estimate_cardinality(node.right, stats)
+        return left * right * selectivity(node.condition, stats)
+    return DEFAULT_TABLE_ROWS
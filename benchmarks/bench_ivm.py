@@ -0,0 +1,84 @@
+# bench_ivm.py
+# Benchmark: recomputação completa x manutenção incremental de visão materializada
+#
+# Uso:
+#   python benchmarks/bench_ivm.py [--escala 1] [--lotes 20] [--tamanho-lote 50]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from parser import parse_sql
+from optimizer import optimize_query
+from executor import execute, table_size
+from data_generator import generate_database, STATUS
+from incremental_view import ViewManager
+
+QUERY = (
+    "SELECT cliente.Nome, pedido.idPedido, pedido.DataPedido, Status.Descricao, pedido.ValorTotalPedido "
+    "FROM Cliente "
+    "JOIN pedido ON cliente.idCliente = pedido.Cliente_idCliente "
+    "JOIN Status ON Status.idStatus = pedido.Status_idStatus "
+    "WHERE Status.Descricao = 'Aberto' AND cliente.TipoCliente_idTipoCliente = 1"
+)
+
+
+def new_pedidos(first_id, count, num_clientes, rng):
+    return [
+        {'idPedido': first_id + k,
+         'Status_idStatus': rng.randint(1, len(STATUS)),
+         'DataPedido': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+         'ValorTotalPedido': rng.choice([0, 0, 10, 50, 120, 999]),
+         'Cliente_idCliente': rng.randint(1, num_clientes)}
+        for k in range(count)
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Recomputação completa x manutenção incremental de visão')
+    ap.add_argument('--escala', type=float, default=1.0)
+    ap.add_argument('--lotes', type=int, default=20)
+    ap.add_argument('--tamanho-lote', type=int, default=50)
+    ap.add_argument('--seed', type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    db = generate_database(args.escala, seed=args.seed)
+    num_clientes = table_size(db, 'Cliente')
+    tree, _ = optimize_query(parse_sql(QUERY))
+
+    manager = ViewManager(db)
+    view = manager.register('pedidos_abertos', tree)
+
+    next_id = table_size(db, 'Pedido') + 1
+    t_full = t_incr = 0.0
+    for _ in range(args.lotes):
+        batch = new_pedidos(next_id, args.tamanho_lote, num_clientes, rng)
+        next_id += args.tamanho_lote
+
+        start = time.perf_counter()
+        manager.append('Pedido', batch)
+        t_incr += time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = execute(tree, db)
+        t_full += time.perf_counter() - start
+
+        if sorted(full.rows()) != sorted(view.result.rows()):
+            raise SystemExit("ERRO: resultado incremental difere da recomputação completa")
+
+    print(f"Consulta: {QUERY}")
+    print(f"Lotes: {args.lotes} x {args.tamanho_lote} tuplas em Pedido")
+    print(f"Tuplas no resultado final: {view.result.size}")
+    print(f"Recomputação completa: {t_full * 1000:10.2f} ms no total, {t_full / args.lotes * 1000:8.3f} ms/lote")
+    print(f"Atualização incremental: {t_incr * 1000:8.2f} ms no total, {t_incr / args.lotes * 1000:8.3f} ms/lote")
+    if t_incr > 0:
+        print(f"Speedup: {t_full / t_incr:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+# bench_suite.py
+# Suíte de benchmarks: tempo de cada etapa do pipeline e da execução,
+# em vários fatores de escala, com comparação contra um baseline salvo.
+#
+# Uso:
+#   python benchmarks/bench_suite.py --escalas 0.1 0.5 1 --saida benchmarks/results/atual.json
+#   python benchmarks/bench_suite.py --baseline benchmarks/results/atual.json
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from parser import parse_sql
+from relational_algebra import ast_to_relational_algebra
+from optimizer import optimize_query
+from execution_plan import get_execution_steps
+from executor import execute
+from plan_comparison import compare_plans
+from table_statistics import default_statistics
+from data_generator import generate_database
+from examples import EXAMPLE_QUERIES
+from metadata import TABLES, FOREIGN_KEYS
+
+# Ordem das tabelas nas cadeias de junção (cada uma liga-se a uma anterior)
+CHAIN_ORDER = [
+    "Cliente", "Pedido", "Status", "Pedido_has_Produto", "Produto",
+    "Categoria", "TipoCliente", "Endereco", "TipoEndereco", "Telefone"
+]
+CHAIN_SIZES = [2, 4, 6, 8, 10]
+DEFAULT_SCALES = [0.1, 0.5, 1.0]
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+def join_chain_query(n):
+    """Consulta com junção de n tabelas seguindo as chaves estrangeiras."""
+    tables = CHAIN_ORDER[:n]
+    joins = []
+    for i, tbl in enumerate(tables[1:], start=1):
+        previous = tables[:i]
+        fk = next(
+            fk for fk in FOREIGN_KEYS
+            if (fk[0] == tbl and fk[2] in previous) or (fk[2] == tbl and fk[0] in previous)
+        )
+        joins.append(f"JOIN {tbl} ON {fk[0]}.{fk[1]} = {fk[2]}.{fk[3]}")
+    select = ", ".join(f"{t}.{TABLES[t][0]}" for t in tables)
+    return (
+        f"SELECT {select} FROM {tables[0]} " + " ".join(joins)
+        + " WHERE Cliente.TipoCliente_idTipoCliente = 1"
+    )
+
+
+def benchmark_queries():
+    queries = dict(EXAMPLE_QUERIES)
+    for n in CHAIN_SIZES:
+        queries[f"Cadeia de {n} tabelas"] = join_chain_query(n)
+    return queries
+
+
+def _timed(fn, repeat):
+    """Executa fn repeat vezes; retorna (menor tempo em ms, último resultado)."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_query(sql, database, repeat, with_graph):
+    timings = {}
+    timings['parse'], parsed = _timed(lambda: parse_sql(sql), repeat)
+    timings['algebra'], original = _timed(lambda: ast_to_relational_algebra(parsed), repeat)
+    timings['optimize'], (optimized, steps) = _timed(lambda: optimize_query(parsed), repeat)
+    timings['compare'], comparison = _timed(lambda: compare_plans(original, optimized), repeat)
+    graph = None
+    if with_graph:
+        from graph_generator import generate_operator_graph
+        timings['graph'], (graph, _) = _timed(
+            lambda: generate_operator_graph(original, optimized, comparison=comparison), repeat
+        )
+    timings['plan'], _ = _timed(
+        lambda: get_execution_steps(original, optimized, graph, steps, comparison), repeat
+    )
+    timings['exec_original'], r_orig = _timed(lambda: execute(original, database), repeat)
+    timings['exec_optimized'], r_opt = _timed(lambda: execute(optimized, database), repeat)
+    return {
+        'timings_ms': timings,
+        'estimated_cost': {
+            'original': comparison.original_cost,
+            'optimized': comparison.optimized_cost,
+        },
+        'rows_original': r_orig.size,
+        'rows_optimized': r_opt.size,
+    }
+
+
+def run_suite(scales, repeat, seed, skew, with_graph):
+    results = []
+    # Estatísticas de referência (SF 1) calculadas uma vez por processo, fora das medições
+    start = time.perf_counter()
+    default_statistics()
+    print(f"Estatísticas de referência: {(time.perf_counter() - start) * 1000:.0f} ms")
+    for scale in scales:
+        start = time.perf_counter()
+        database = generate_database(scale, seed=seed, skew=skew)
+        gen_ms = (time.perf_counter() - start) * 1000
+        print(f"\n== Fator de escala {scale} (geração: {gen_ms:.0f} ms, "
+              f"{sum(len(next(iter(c.values()))) for c in database.values())} tuplas)")
+        for name, sql in benchmark_queries().items():
+            r = run_query(sql, database, repeat, with_graph)
+            r.update({'query': name, 'scale': scale})
+            results.append(r)
+            t = r['timings_ms']
+            flag = "" if r['rows_original'] == r['rows_optimized'] else "  [DIVERGÊNCIA]"
+            print(f"  {name:<24} otimizar {t['optimize']:7.2f} ms | "
+                  f"original {t['exec_original']:9.2f} ms | otimizada {t['exec_optimized']:9.2f} ms | "
+                  f"{r['rows_optimized']} linhas{flag}")
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """
+    Lista (consulta, escala, etapa, baseline, atual) das etapas mais lentas que
+    o baseline; diferenças abaixo de min_delta_ms são tratadas como ruído.
+    Um aumento do custo estimado do plano otimizado também é regressão.
+    """
+    previous = {(r['query'], r['scale']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        base = previous.get((r['query'], r['scale']))
+        if base is None:
+            continue
+        old_cost = base.get('estimated_cost', {}).get('optimized')
+        new_cost = r['estimated_cost']['optimized']
+        if old_cost is not None and new_cost > old_cost * (1 + threshold):
+            regressions.append((r['query'], r['scale'], 'estimated_cost', old_cost, new_cost))
+        old = base['timings_ms']
+        for stage, ms in r['timings_ms'].items():
+            if stage not in old or ms - old[stage] < min_delta_ms:
+                continue
+            if ms > old[stage] * (1 + threshold):
+                regressions.append((r['query'], r['scale'], stage, old[stage], ms))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Suíte de benchmarks do processador de consultas')
+    ap.add_argument('--escalas', type=float, nargs='+', default=DEFAULT_SCALES)
+    ap.add_argument('--repeticoes', type=int, default=3)
+    ap.add_argument('--seed', type=int, default=42)
+    ap.add_argument('--skew', type=float, default=0.0)
+    ap.add_argument('--grafo', action='store_true', help='inclui a geração do grafo (matplotlib)')
+    ap.add_argument('--saida', help='arquivo JSON onde salvar os resultados')
+    ap.add_argument('--baseline', help='arquivo JSON de uma execução anterior para comparação')
+    ap.add_argument('--tolerancia', type=float, default=DEFAULT_THRESHOLD,
+                    help='aumento relativo de tempo considerado regressão (padrão 0.20)')
+    ap.add_argument('--delta-minimo', type=float, default=DEFAULT_MIN_DELTA_MS,
+                    help='diferença absoluta mínima em ms para considerar regressão (padrão 1.0)')
+    args = ap.parse_args()
+
+    results = run_suite(args.escalas, args.repeticoes, args.seed, args.skew, args.grafo)
+
+    if args.saida:
+        os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'seed': args.seed,
+                'skew': args.skew,
+                'results': results,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados salvos em {args.saida}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerancia, args.delta_minimo)
+        if regressions:
+            print(f"\nRegressões (> {args.tolerancia:.0%}):")
+            for query, scale, stage, old, new in regressions:
+                unit = "" if stage == 'estimated_cost' else " ms"
+                print(f"  {query} @ {scale} [{stage}]: {old:.2f}{unit} -> {new:.2f}{unit}")
+            sys.exit(1)
+        print("\nSem regressões em relação ao baseline.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+# conftest.py
+# Os módulos da aplicação são importados sem pacote (como em app/main.py)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
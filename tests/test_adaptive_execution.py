@@ -0,0 +1,62 @@
+# test_adaptive_execution.py
+# A execução adaptativa deve devolver as mesmas tuplas que a execução estática
+
+import pytest
+
+from parser import parse_sql
+from relational_algebra import ast_to_relational_algebra
+from optimizer import optimize_query
+from executor import execute
+from adaptive_execution import execute_adaptive
+from table_statistics import StatisticsStore
+from data_generator import generate_database
+
+THREE_WAY = (
+    "SELECT Cliente.Nome, Pedido.idPedido, Status.Descricao FROM Cliente "
+    "JOIN Pedido ON Cliente.idCliente = Pedido.Cliente_idCliente "
+    "JOIN Status ON Pedido.Status_idStatus = Status.idStatus"
+)
+
+SINGLE_SIDED = "SELECT Status.Descricao, pedido.idPedido FROM pedido JOIN Status ON Status.Descricao = 'Aberto'"
+
+
+@pytest.fixture(scope='module')
+def skewed():
+    return generate_database(0.2, seed=3, skew=1.5)
+
+
+def _trees(sql):
+    parsed = parse_sql(sql)
+    return [ast_to_relational_algebra(parsed), optimize_query(parsed)[0]]
+
+
+@pytest.mark.parametrize('where', ["Cliente.idCliente < 5", "Cliente.idCliente = 1", "Cliente.idCliente > 150"])
+def test_replanned_execution_returns_same_rows(where, skewed):
+    # Com skew, os pedidos dos clientes filtrados fogem da estimativa uniforme
+    tree = optimize_query(parse_sql(f"{THREE_WAY} WHERE {where}"))[0]
+    stats = StatisticsStore.from_database(skewed)
+    result, events = execute_adaptive(tree, skewed, stats, divergence_factor=1.1)
+    assert any(e.startswith("Reotimização") for e in events)
+    assert sorted(result.rows()) == sorted(execute(tree, skewed).rows())
+
+
+def test_execution_without_replanning_returns_same_rows(skewed):
+    for tree in _trees(THREE_WAY + " WHERE Status.idStatus = 1"):
+        result, _ = execute_adaptive(tree, skewed, StatisticsStore.from_database(skewed))
+        assert sorted(result.rows()) == sorted(execute(tree, skewed).rows())
+
+
+def test_single_sided_join_condition_is_not_dropped():
+    database = generate_database(0.2)
+    for tree in _trees(SINGLE_SIDED):
+        expected = execute(tree, database)
+        result, _ = execute_adaptive(tree, database, divergence_factor=1.1)
+        assert sorted(result.rows()) == sorted(expected.rows())
+
+
+def test_condition_on_first_input_only_is_not_dropped():
+    database = generate_database(0.2)
+    sql = "SELECT Status.Descricao, Pedido.idPedido FROM Status JOIN Pedido ON Status.Descricao = 'Aberto'"
+    tree = ast_to_relational_algebra(parse_sql(sql))
+    result, _ = execute_adaptive(tree, database)
+    assert sorted(result.rows()) == sorted(execute(tree, database).rows())
@@ -0,0 +1,94 @@
+# test_incremental_view.py
+# A visão mantida incrementalmente deve ser igual à recomputação completa
+
+import random
+
+import pytest
+
+from parser import parse_sql
+from relational_algebra import ast_to_relational_algebra
+from optimizer import optimize_query
+from executor import Batch, execute, insert_rows, table_size
+from data_generator import generate_database
+from incremental_view import MaterializedView, ViewManager
+
+EQUI = (
+    "SELECT Cliente.Nome, Pedido.idPedido, Status.Descricao FROM Cliente "
+    "JOIN Pedido ON Cliente.idCliente = Pedido.Cliente_idCliente "
+    "JOIN Status ON Status.idStatus = Pedido.Status_idStatus "
+    "WHERE Status.Descricao <> 'Cancelado' AND Cliente.TipoCliente_idTipoCliente IN (1, 2)"
+)
+
+NON_EQUI = (
+    "SELECT Cliente.Nome, Pedido.idPedido FROM Cliente "
+    "JOIN Pedido ON Pedido.Cliente_idCliente < Cliente.idCliente "
+    "WHERE Pedido.ValorTotalPedido > 100"
+)
+
+
+def _trees(sql):
+    parsed = parse_sql(sql)
+    return [ast_to_relational_algebra(parsed), optimize_query(parsed)[0]]
+
+
+def _clientes(database, count, rng):
+    first = table_size(database, 'Cliente') + 1
+    return [
+        {'idCliente': first + k, 'Nome': f'Novo{first + k}', 'Email': f'novo{first + k}@x.com',
+         'Nascimento': '2000-01-01', 'Senha': 'x', 'TipoCliente_idTipoCliente': rng.randint(1, 3),
+         'DataRegistro': '2025-01-01'}
+        for k in range(count)
+    ]
+
+
+def _pedidos(database, count, rng):
+    first = table_size(database, 'Pedido') + 1
+    num_clientes = table_size(database, 'Cliente')
+    return [
+        {'idPedido': first + k, 'Status_idStatus': rng.randint(1, 5), 'DataPedido': '2025-06-01',
+         'ValorTotalPedido': rng.choice([0, 50, 120, 999]), 'Cliente_idCliente': rng.randint(1, num_clientes)}
+        for k in range(count)
+    ]
+
+
+def _assert_matches(view, tree, database):
+    assert sorted(view.result.rows()) == sorted(execute(tree, database).rows())
+
+
+@pytest.mark.parametrize('sql', [EQUI, NON_EQUI])
+def test_appends_to_left_and_right_inputs(sql):
+    rng = random.Random(1)
+    for tree in _trees(sql):
+        database = generate_database(0.05, seed=5)
+        manager = ViewManager(database)
+        view = manager.register('v', tree)
+        for _ in range(3):
+            # Cliente é a entrada esquerda e Pedido a direita da junção
+            manager.append('Cliente', _clientes(database, 4, rng))
+            _assert_matches(view, tree, database)
+            manager.append('Pedido', _pedidos(database, 20, rng))
+            _assert_matches(view, tree, database)
+
+
+def test_equi_join_keeps_persistent_indexes():
+    tree = _trees(EQUI)[1]
+    database = generate_database(0.05, seed=5)
+    manager = ViewManager(database)
+    view = manager.register('v', tree)
+    indexes = [(left.index, right.index) for left, right in view._states.values()]
+    assert all(l is not None and r is not None for l, r in indexes)
+    manager.append('Pedido', _pedidos(database, 20, random.Random(2)))
+    assert [(l.index, r.index) for l, r in view._states.values()] == indexes
+
+
+@pytest.mark.parametrize('sql', [EQUI, NON_EQUI])
+def test_delta_from_rows_falls_back_to_concat(sql):
+    rng = random.Random(3)
+    for tree in _trees(sql):
+        database = generate_database(0.05, seed=5)
+        view = MaterializedView(tree, database)
+        for table, make in [('Pedido', _pedidos), ('Cliente', _clientes), ('Pedido', _pedidos)]:
+            rows = make(database, 10, rng)
+            insert_rows(database, table, rows)
+            view.propagate(table, Batch.from_rows(table, rows))
+            _assert_matches(view, tree, database)
@@ -0,0 +1,70 @@
+# test_optimizer.py
+# A árvore otimizada deve produzir as mesmas tuplas que a árvore original
+
+import pytest
+
+from parser import parse_sql
+from relational_algebra import ast_to_relational_algebra, Selection
+from optimizer import optimize_query
+from executor import execute
+from data_generator import generate_database
+
+JOIN = "FROM Cliente JOIN Pedido ON Cliente.idCliente = Pedido.Cliente_idCliente"
+
+QUERIES = [
+    "SELECT idCliente, Nome FROM Cliente WHERE idCliente > 5",
+    "SELECT Cliente.Nome FROM Cliente WHERE Cliente.Email = 'Luffy@gmail.com'",
+    f"SELECT Cliente.Nome, Pedido.idPedido {JOIN} "
+    "WHERE (Cliente.TipoCliente_idTipoCliente = 1 AND Pedido.ValorTotalPedido > 100) "
+    "OR (Cliente.TipoCliente_idTipoCliente = 2 AND Pedido.ValorTotalPedido = 0)",
+    f"SELECT Cliente.Nome, Pedido.idPedido {JOIN} "
+    "WHERE Pedido.Status_idStatus NOT IN (1, 5) AND (Cliente.idCliente < 10 OR Pedido.idPedido < 20)",
+    "SELECT Cliente.Nome FROM Cliente "
+    "WHERE Cliente.idCliente IN (1, 2, 3, 50, 70) AND NOT (Cliente.Nome = 'Luffy' OR Cliente.idCliente BETWEEN 60 AND 80)",
+    f"SELECT Cliente.Nome, Pedido.idPedido {JOIN} "
+    "WHERE Cliente.idCliente = 3 OR Cliente.idCliente = 4 OR Pedido.ValorTotalPedido = 0",
+    f"SELECT Cliente.Nome, Pedido.idPedido {JOIN} "
+    "WHERE NOT (Cliente.TipoCliente_idTipoCliente IN (1, 2) AND Pedido.Status_idStatus = 3)",
+    "SELECT Cliente.Nome FROM Cliente WHERE Cliente.Nome LIKE 'L%' OR Cliente.Email IS NULL",
+]
+
+
+@pytest.fixture(scope='module')
+def database():
+    return generate_database(0.2, seed=7)
+
+
+@pytest.mark.parametrize('sql', QUERIES)
+def test_optimized_tree_returns_same_rows(sql, database):
+    parsed = parse_sql(sql)
+    original = execute(ast_to_relational_algebra(parsed), database)
+    optimized, _ = optimize_query(parsed)
+    assert sorted(execute(optimized, database).rows()) == sorted(original.rows())
+
+
+def _selections(node):
+    found = []
+    while node is not None:
+        if isinstance(node, Selection):
+            found.append(str(node.condition))
+        children = [getattr(node, a) for a in ('child', 'left', 'right') if hasattr(node, a)]
+        found.extend(s for c in children[1:] for s in _selections(c))
+        node = children[0] if children else None
+    return found
+
+
+def test_disjunction_pushes_implied_filters_and_keeps_original():
+    sql = QUERIES[2]
+    optimized, _ = optimize_query(parse_sql(sql))
+    selections = _selections(optimized)
+    assert "Cliente.TipoCliente_idTipoCliente = 1 OR Cliente.TipoCliente_idTipoCliente = 2" in selections
+    assert "Pedido.ValorTotalPedido > 100 OR Pedido.ValorTotalPedido = 0" in selections
+    # Predicado original continua acima da junção
+    assert str(optimized.child.condition).startswith("(Cliente.TipoCliente_idTipoCliente = 1 AND")
+
+
+def test_unparsed_where_text_is_kept_above_joins():
+    parsed = parse_sql(f"SELECT Cliente.Nome {JOIN} WHERE Cliente.Nome ~ 'x' AND Pedido.idPedido = 1")
+    assert parsed['where'] == ["Cliente.Nome ~ 'x'", "Pedido.idPedido = 1"]
+    optimized, _ = optimize_query(parsed)
+    assert str(optimized.child.condition) == "Cliente.Nome ~ 'x'"
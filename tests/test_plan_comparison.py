@@ -0,0 +1,32 @@
+# test_plan_comparison.py
+# Modelo de custo: a otimização nunca deve piorar o custo estimado dos exemplos
+
+import pytest
+
+from parser import parse_sql
+from relational_algebra import ast_to_relational_algebra
+from optimizer import optimize_query
+from plan_comparison import compare_plans
+from examples import EXAMPLE_QUERIES
+
+
+def _compare(sql):
+    parsed = parse_sql(sql)
+    optimized, _ = optimize_query(parsed)
+    return compare_plans(ast_to_relational_algebra(parsed), optimized)
+
+
+@pytest.mark.parametrize('name', sorted(EXAMPLE_QUERIES))
+def test_examples_do_not_increase_cost(name):
+    comparison = _compare(EXAMPLE_QUERIES[name])
+    assert comparison.improvement >= 0
+    assert comparison.optimized_cost <= comparison.original_cost
+
+
+def test_projection_over_scan_counts_as_pruned_read():
+    comparison = _compare("SELECT Nome FROM Cliente WHERE idCliente > 5")
+    # π(Cliente) substitui a leitura completa da tabela: Cliente não é contada duas vezes
+    relations = [op for op in comparison.optimized if op.label == 'Cliente']
+    assert relations
+    assert comparison.optimized_cost < sum(op.volume for op in comparison.optimized)
+    assert comparison.improvement > 0
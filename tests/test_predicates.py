@@ -0,0 +1,208 @@
+# test_predicates.py
+# Normalização (CNF/DNF), filtros implicados e avaliação de predicados
+
+import operator
+
+import pytest
+
+from executor import Batch
+from predicates import (
+    MAX_NORMAL_FORM_TERMS,
+    And,
+    Comparison,
+    InList,
+    Or,
+    PredicateParseError,
+    _compare,
+    _fold_equalities,
+    _member,
+    evaluate,
+    implied_table_filters,
+    parse_predicate,
+    to_cnf,
+    to_dnf,
+)
+
+README_EXAMPLE = (
+    "(Cliente.TipoCliente_idTipoCliente = 1 AND Pedido.ValorTotalPedido > 100) "
+    "OR (Cliente.TipoCliente_idTipoCliente = 2 AND Pedido.ValorTotalPedido = 0)"
+)
+
+
+def _texts(nodes):
+    return sorted(str(n) for n in nodes)
+
+
+def _clientes(rows):
+    return Batch.from_rows('Cliente', rows)
+
+
+def _ids(batch, condition):
+    """idCliente das tuplas que satisfazem condition."""
+    ids = batch.column('Cliente.idCliente')
+    return [ids[i] for i in evaluate(parse_predicate(condition), batch)]
+
+
+# --- CNF / DNF ---
+
+def test_cnf_distributes_or_over_and():
+    clauses = to_cnf(parse_predicate("(A.x = 1 AND B.y = 2) OR A.z = 3"))
+    assert _texts(clauses) == ["A.x = 1 OR A.z = 3", "B.y = 2 OR A.z = 3"]
+
+
+def test_dnf_distributes_and_over_or():
+    terms = to_dnf(parse_predicate("A.x = 1 AND (B.y = 2 OR A.z = 3)"))
+    assert _texts(terms) == ["A.x = 1 AND A.z = 3", "A.x = 1 AND B.y = 2"]
+
+
+def test_normal_forms_push_not_down():
+    node = parse_predicate("NOT (A.x = 1 OR (B.y IN (1, 2) AND A.z >= 'a'))")
+    assert _texts(to_cnf(node)) == ["A.x <> 1", "B.y NOT IN (1, 2) OR A.z < 'a'"]
+    assert _texts(to_dnf(node)) == ["A.x <> 1 AND A.z < 'a'", "A.x <> 1 AND B.y NOT IN (1, 2)"]
+
+
+def test_normal_forms_remove_duplicate_literals():
+    assert _texts(to_cnf(parse_predicate("A.x = 1 OR A.x = 1"))) == ["A.x = 1"]
+
+
+def test_cnf_falls_back_to_whole_predicate_when_too_large():
+    # 7 conjunções de 2 termos unidas por OR geram 2^7 cláusulas
+    terms = [f"(A.x{i} = 1 AND B.y{i} = 2)" for i in range(7)]
+    assert 2 ** 7 > MAX_NORMAL_FORM_TERMS
+    node = parse_predicate(" OR ".join(terms))
+    assert to_cnf(node) == [node]
+
+
+def test_dnf_returns_none_when_too_large():
+    terms = [f"(A.x{i} = 1 OR B.y{i} = 2)" for i in range(7)]
+    assert to_dnf(parse_predicate(" AND ".join(terms))) is None
+
+
+# --- Filtros implicados ---
+
+def test_implied_filters_readme_example():
+    implied = implied_table_filters(parse_predicate(README_EXAMPLE))
+    assert {t: str(p) for t, p in implied.items()} == {
+        'cliente': "Cliente.TipoCliente_idTipoCliente = 1 OR Cliente.TipoCliente_idTipoCliente = 2",
+        'pedido': "Pedido.ValorTotalPedido > 100 OR Pedido.ValorTotalPedido = 0",
+    }
+
+
+def test_implied_filter_requires_every_term_to_restrict_the_table():
+    implied = implied_table_filters(parse_predicate("(A.x = 1 AND B.y = 2) OR A.x = 3"))
+    assert {t: str(p) for t, p in implied.items()} == {'a': "A.x = 1 OR A.x = 3"}
+
+
+def test_implied_filters_apply_absorption():
+    node = parse_predicate(
+        "Cliente.TipoCliente_idTipoCliente = 1 AND (Cliente.idCliente < 10 OR Pedido.idPedido < 20) "
+        "OR Cliente.idCliente = 3"
+    )
+    implied = implied_table_filters(node)
+    assert str(implied['cliente']) == "Cliente.TipoCliente_idTipoCliente = 1 OR Cliente.idCliente = 3"
+
+
+def test_normal_forms_apply_absorption():
+    assert _texts(to_dnf(parse_predicate("A.x = 1 OR (A.x = 1 AND B.y = 2)"))) == ["A.x = 1"]
+    assert _texts(to_cnf(parse_predicate("A.x = 1 AND (A.x = 1 OR B.y = 2)"))) == ["A.x = 1"]
+
+
+def test_no_implied_filters_for_single_table_or_unqualified_columns():
+    assert implied_table_filters(parse_predicate("A.x = 1 OR A.y = 2")) == {}
+    assert implied_table_filters(parse_predicate("A.x = 1 OR y = 2")) == {}
+
+
+def test_no_implied_filters_when_dnf_is_too_large():
+    terms = [f"(A.x{i} = 1 OR B.y{i} = 2)" for i in range(7)]
+    assert implied_table_filters(parse_predicate(" AND ".join(terms) + " OR A.z = 0")) == {}
+
+
+# --- Valores nulos ---
+
+NULL_ROWS = [
+    {'idCliente': 1, 'Nome': 'Ana', 'Email': None},
+    {'idCliente': 2, 'Nome': None, 'Email': 'b@x.com'},
+    {'idCliente': 3, 'Nome': 'Caio', 'Email': 'c@x.com'},
+]
+
+
+@pytest.mark.parametrize('condition, expected', [
+    ("Cliente.Nome = 'Ana'", [1]),
+    ("NOT Cliente.Nome = 'Ana'", [3]),
+    ("NOT (Cliente.Nome = 'Ana' OR Cliente.Email = 'c@x.com')", []),
+    ("NOT NOT Cliente.Nome = 'Ana'", [1]),
+    ("Cliente.Nome IN ('Ana', 'Caio')", [1, 3]),
+    ("Cliente.Nome NOT IN ('Ana')", [3]),
+    ("NOT Cliente.Nome IN ('Ana')", [3]),
+    ("Cliente.Nome BETWEEN 'A' AND 'B'", [1]),
+    ("Cliente.Nome NOT BETWEEN 'A' AND 'B'", [3]),
+    ("NOT (Cliente.Nome BETWEEN 'A' AND 'B')", [3]),
+    ("Cliente.Nome IS NULL", [2]),
+    ("NOT Cliente.Nome IS NULL", [1, 3]),
+    ("Cliente.Email NOT LIKE 'c@%'", [2]),
+    ("Cliente.Nome = NULL", []),
+    ("Cliente.Nome = NULL OR Cliente.Nome = 'Ana'", [1]),
+    ("Cliente.Nome IN ('Ana', NULL)", [1]),
+    ("Cliente.Nome NOT IN ('Ana', NULL)", []),
+    ("NOT Cliente.Nome IN ('Ana', NULL)", []),
+    ("Cliente.Nome NOT IN ('Ana') OR Cliente.idCliente = 1", [1, 3]),
+])
+def test_null_values_are_never_matched_by_comparisons(condition, expected):
+    assert _ids(_clientes(NULL_ROWS), condition) == expected
+
+
+# --- Coerção texto/número ---
+
+MIXED_VALUES = [5, 5.0, '5', '5.0', 'abc', 7, None, '7']
+LITERALS = [5, '5', 7.0, 'abc', None]
+
+
+def test_fold_equalities_groups_equalities_on_the_same_column():
+    node = parse_predicate("A.x = 1 OR 2 = A.x OR A.y = 3 OR A.x > 4 OR A.x = NULL")
+    folded = _fold_equalities(node.items)
+    assert [str(n) for n in folded] == ["A.x IN (1, 2)", "A.y IN (3)", "A.x > 4", "A.x = NULL"]
+
+
+@pytest.mark.parametrize('value', MIXED_VALUES)
+@pytest.mark.parametrize('literal', LITERALS)
+def test_member_matches_compare_equality(value, literal):
+    node = InList('A.x', [literal])
+    assert _member(value, node) == _compare(value, operator.eq, literal)
+
+
+def test_folded_or_matches_separate_comparisons():
+    rows = [{'idCliente': i, 'Nome': v} for i, v in enumerate(MIXED_VALUES)]
+    batch = _clientes(rows)
+    expected = sorted({
+        i for v in LITERALS
+        for i in evaluate(Comparison(('col', 'Cliente.Nome'), '=', ('lit', v)), batch)
+    })
+    chain = Or([Comparison(('col', 'Cliente.Nome'), '=', ('lit', v)) for v in LITERALS])
+    assert evaluate(chain, batch) == expected
+    assert evaluate(parse_predicate("Cliente.Nome IN (5, '5', 7.0, 'abc', NULL)"), batch) == expected
+
+
+# --- Parser ---
+
+@pytest.mark.parametrize('text, expected', [
+    ("Cliente.Nome LIKE 'A%'", "Cliente.Nome LIKE 'A%'"),
+    ("Cliente.Email IS NOT NULL", "Cliente.Email IS NOT NULL"),
+    ("TRUE", "TRUE"),
+    ("Produto.Preco > 1.5e3", "Produto.Preco > 1500.0"),
+    ("x BETWEEN 1 AND 3", "x >= 1 AND x <= 3"),
+    ("Cliente.Nome = 'O''Brien'", "Cliente.Nome = 'O''Brien'"),
+])
+def test_parse_round_trip(text, expected):
+    assert str(parse_predicate(text)) == expected
+
+
+@pytest.mark.parametrize('text', ["Cliente.idCliente =", "(a = 1", "a IN ()", "a = 1 b", "a ~ 'x'"])
+def test_parse_errors(text):
+    with pytest.raises(PredicateParseError):
+        parse_predicate(text)
+
+
+def test_and_or_precedence():
+    node = parse_predicate("A.x = 1 OR A.y = 2 AND A.z = 3")
+    assert isinstance(node, Or)
+    assert isinstance(node.items[1], And)
@@ -0,0 +1,90 @@
+# test_query_cache.py
+# Cache compartilhado: cálculo único por chave, LRU por memória e reuso entre sessões
+
+import importlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+SQL = "SELECT Cliente.Nome FROM Cliente WHERE Cliente.idCliente > 5"
+
+
+@pytest.fixture(scope='module')
+def graph_calls():
+    return []
+
+
+@pytest.fixture(scope='module')
+def query_cache(graph_calls):
+    # graph_generator depende de networkx/matplotlib: substituído por um stub
+    def generate_operator_graph(original_tree, optimized_tree, path=None, comparison=None):
+        graph_calls.append(path)
+        with open(path, 'wb') as f:
+            f.write(b'png')
+        return 'grafo', path
+
+    fake = types.ModuleType('graph_generator')
+    fake.generate_operator_graph = generate_operator_graph
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, 'graph_generator', fake)
+        mp.delitem(sys.modules, 'query_cache', raising=False)
+        yield importlib.import_module('query_cache')
+
+
+def test_concurrent_callers_compute_each_key_once(query_cache):
+    cache = query_cache.QueryCache()
+    barrier = threading.Barrier(50)
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return ['valor']
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_or_compute('parsed', 'k', compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(results) == 50 and all(r is results[0] for r in results)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (49, 1)
+
+
+def test_lru_eviction_respects_byte_limit(query_cache):
+    value = 'x' * 1000
+    size = query_cache.estimate_size(value)
+    cache = query_cache.QueryCache(max_bytes=int(size * 2.5))
+    cache.put('plan', 'a', value)
+    cache.put('plan', 'b', 'y' * 1000)
+    assert cache.get('plan', 'a') is value      # 'a' passa a ser a mais recente
+    cache.put('plan', 'c', 'z' * 1000)
+    assert cache.get('plan', 'b') is None
+    assert cache.get('plan', 'a') is value
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['entries'] == 2
+    assert stats['bytes'] <= cache.max_bytes
+
+
+def test_sessions_reuse_entries(query_cache, graph_calls):
+    cache = query_cache.QueryCache()
+    first = query_cache.process_query(cache, SQL)
+    misses = cache.stats()['misses']
+    # Outra sessão, mesma consulta com espaços e ';' diferentes
+    second = query_cache.process_query(cache, "  " + SQL.replace(" ", "  ") + ";")
+    assert second['key'] == first['key']
+    for name in ('parsed', 'original', 'optimized', 'plan', 'comparison', 'image'):
+        assert second[name] is first[name]
+    assert first['image'] == b'png'
+    assert len(graph_calls) == 1
+    stats = cache.stats()
+    assert stats['misses'] == misses
+    assert stats['hits'] == 6
@@ -0,0 +1,35 @@
+# test_table_statistics.py
+# Contagem de valores distintos por sketch e coleta incremental
+
+from table_statistics import DISTINCT_SKETCH_SIZE, DistinctSketch, StatisticsStore
+
+
+def _database(ids):
+    return {'Cliente': {'idCliente': list(ids), 'Nome': [f"n{i % 7}" for i in ids]}}
+
+
+def test_sketch_is_exact_up_to_its_size():
+    sketch = DistinctSketch()
+    sketch.update(i % 300 for i in range(5000))
+    sketch.update([None, 1.0, '1'])
+    assert sketch.estimate() == 302
+    assert len(sketch._hashes) <= DISTINCT_SKETCH_SIZE
+
+
+def test_sketch_estimate_is_bounded_above_its_size():
+    sketch = DistinctSketch()
+    sketch.update(range(50000))
+    assert len(sketch._hashes) == DISTINCT_SKETCH_SIZE
+    assert abs(sketch.estimate() - 50000) / 50000 < 0.1
+
+
+def test_incremental_refresh_matches_full_collection():
+    ids = list(range(20000))
+    database = _database(ids[:5000])
+    stats = StatisticsStore.from_database(database)
+    database['Cliente'] = _database(ids)['Cliente']
+    stats.refresh(database)
+    full = StatisticsStore.from_database(database)
+    assert stats.distinct == full.distinct
+    assert stats.distinct['cliente.nome'] == 7
+    assert stats.row_counts == {'cliente': 20000}